@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Benchmarks run as `python -m benchmarks.<name>` from the repo root; make the
+# shared src/python packages (ingestion, models) importable the same way the
+# Lambda layers do.
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "python"
+    ),
+)
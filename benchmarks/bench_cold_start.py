@@ -0,0 +1,88 @@
+"""
+Cold-start import time for the Lambda handlers.
+
+Each sample imports the handler module in a fresh interpreter with the same
+sys.path layout Lambda uses (function dir first, then the layer's python/ dir,
+here src/python). Run from the repo root:
+
+    python -m benchmarks.bench_cold_start --runs 10 --importtime
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LAMBDAS = REPO_ROOT / "src" / "python" / "lambdas"
+LAYER_DIR = REPO_ROOT / "src" / "python"
+
+HANDLERS = {
+    "fetch_data_lambda": LAMBDAS / "fetch_data_lambda",
+    "fetch_strategy_kpis_lambda": LAMBDAS / "fetch_strategy_kpis_lambda",
+    "ingest_schwab_transactions": LAMBDAS / "ingest_lambda",
+}
+
+SNIPPET = """
+import sys, time
+sys.path[:0] = [{function_dir!r}, {layer_dir!r}]
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def sample(module: str, function_dir: Path) -> float:
+    code = SNIPPET.format(
+        function_dir=str(function_dir), layer_dir=str(LAYER_DIR), module=module
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip())
+
+
+def slowest_imports(module: str, function_dir: Path, top: int) -> list[str]:
+    code = SNIPPET.format(
+        function_dir=str(function_dir), layer_dir=str(LAYER_DIR), module=module
+    )
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return [f"{us / 1000:8.1f} ms {name}" for us, name in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure handler import time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--handler", choices=sorted(HANDLERS), default=None)
+    parser.add_argument("--importtime", action="store_true", help="Show top imports")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    handlers = [args.handler] if args.handler else list(HANDLERS)
+    for module in handlers:
+        function_dir = HANDLERS[module]
+        timings = [sample(module, function_dir) for _ in range(args.runs)]
+        print(
+            f"{module:28} median {statistics.median(timings):7.1f} ms  "
+            f"min {min(timings):7.1f} ms  ({args.runs} runs)"
+        )
+        if args.importtime:
+            for row in slowest_imports(module, function_dir, args.top):
+                print(f"    {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Parse benchmark for the distribution scrapers against saved fixture pages.
+
+Compares the old BeautifulSoup("html.parser") walk with the lxml/XPath parsers
+in ingestion.distributions. Run from the repo root:
+
+    python -m benchmarks.bench_distribution_parsers --repeat 200
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from ingestion.distributions import (
+    parse_bitwise_distributions,
+    parse_yield_max_distributions,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html"
+
+
+def bs4_parse_yield_max_distributions(html: bytes, ticker: str) -> list[dict]:
+    # Reference copy of the pre-lxml scraper, kept for comparison only
+    soup = BeautifulSoup(html, "html.parser")
+    target_table = None
+    for table in soup.find_all("table"):
+        headers = [th.text.strip().lower() for th in table.find_all("th")]
+        if (
+            "distribution per share" in headers
+            and "declared date" in headers
+            and "ex date" in headers
+            and "record date" in headers
+            and "payable date" in headers
+        ):
+            target_table = table
+            break
+
+    records = []
+    for row in target_table.find("tbody").find_all("tr"):
+        cols = [td.text.strip() for td in row.find_all("td")]
+        if len(cols) < 6:
+            continue
+        _, amount, declared, ex, record, payable = cols
+        records.append(
+            {
+                "ticker": ticker,
+                "amount": float(amount),
+                "declared_date": pd.to_datetime(declared).strftime("%Y-%m-%d"),
+                "ex_date": pd.to_datetime(ex).strftime("%Y-%m-%d"),
+                "record_date": pd.to_datetime(record).strftime("%Y-%m-%d"),
+                "payable_date": pd.to_datetime(payable).strftime("%Y-%m-%d"),
+            }
+        )
+    return records
+
+
+def bs4_parse_bitwise_distributions(html: bytes, ticker: str) -> list[dict]:
+    # Reference copy of the pre-lxml scraper, kept for comparison only
+    soup = BeautifulSoup(html, "html.parser")
+    root = soup.find("div", id="distributions")
+    root = soup.find("div", id="distributions")
+
+    records = []
+    for row in root.find_all("div", recursive=True):
+        children = row.find_all("div", recursive=False)
+        if len(children) != 5:
+            continue
+        declared, ex, record, payable, amount = [c.text.strip() for c in children]
+        if "$" not in amount:
+            continue
+        records.append(
+            {
+                "ticker": ticker,
+                "amount": float(amount.replace("$", "").replace(",", "")),
+                "declared_date": pd.to_datetime(declared).strftime("%Y-%m-%d"),
+                "ex_date": pd.to_datetime(ex).strftime("%Y-%m-%d"),
+                "record_date": pd.to_datetime(record).strftime("%Y-%m-%d"),
+                "payable_date": pd.to_datetime(payable).strftime("%Y-%m-%d"),
+            }
+        )
+    return records
+
+
+CASES = [
+    (
+        "yieldmax_msty.html",
+        "MSTY",
+        bs4_parse_yield_max_distributions,
+        parse_yield_max_distributions,
+    ),
+    (
+        "bitwise_imst.html",
+        "IMST",
+        bs4_parse_bitwise_distributions,
+        parse_bitwise_distributions,
+    ),
+]
+
+
+def time_parser(parser, html: bytes, ticker: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parser(html, ticker)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark distribution parsers.")
+    parser.add_argument("--repeat", type=int, default=100, help="Parses per case")
+    args = parser.parse_args()
+
+    for fixture, ticker, old, new in CASES:
+        html = (FIXTURES / fixture).read_bytes()
+
+        old_records, new_records = old(html, ticker), new(html, ticker)
+        if old_records != new_records:
+            raise AssertionError(f"{fixture}: lxml parser output differs from bs4")
+
+        old_ms = time_parser(old, html, ticker, args.repeat)
+        new_ms = time_parser(new, html, ticker, args.repeat)
+        print(
+            f"{fixture:24} {len(new_records):4d} rows  "
+            f"bs4: {old_ms:8.2f} ms  lxml: {new_ms:8.2f} ms  "
+            f"speedup: {old_ms / new_ms:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
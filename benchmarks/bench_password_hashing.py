@@ -0,0 +1,106 @@
+"""
+Cost calibration for the userservice password hashers.
+
+Times scrypt (and argon2, when argon2-cffi is installed) at a range of costs
+on this machine, then picks the highest cost per Lambda memory size that stays
+under the target latency. Lambda gives a function a CPU share proportional to
+its memory (one full vCPU at 1769 MB), so a hash that takes t ms on a full core
+takes about t * 1769 / memory ms there. The output is the
+SCRYPT_N_BY_MEMORY table in password_hashing. Run from the repo root, ideally
+on the same CPU architecture as the function (arm64):
+
+    python -m benchmarks.bench_password_hashing --target-ms 100
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+USERSERVICE_DIR = REPO_ROOT / "src" / "python" / "lambdas" / "userservice"
+
+sys.path.insert(0, str(USERSERVICE_DIR))
+import password_hashing  # noqa: E402
+
+FULL_VCPU_MB = 1769
+MEMORY_SIZES = [128, 256, 512, 1024, 1769]
+
+
+def median_ms(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def lambda_ms(local_ms: float, memory_mb: int) -> float:
+    return local_ms * FULL_VCPU_MB / min(memory_mb, FULL_VCPU_MB)
+
+
+def calibrate(costs: dict, target_ms: float) -> dict:
+    """
+    {memory MB: highest cost whose estimated Lambda latency <= target}, given
+    {cost: local ms}. Falls back to the cheapest cost when none fit.
+    """
+    table = {}
+    for memory_mb in MEMORY_SIZES:
+        fitting = [
+            c for c, ms in costs.items() if lambda_ms(ms, memory_mb) <= target_ms
+        ]
+        table[memory_mb] = max(fitting) if fitting else min(costs)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate password hash cost.")
+    parser.add_argument("--target-ms", type=float, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    scrypt = {}
+    print("scrypt (r=8, p=1)")
+    for exponent in range(12, 18):
+        n = 2**exponent
+        hasher = password_hashing.ScryptHasher(n=n)
+        scrypt[n] = median_ms(lambda: hasher.hash("correct horse", "pepper"), args.runs)
+        estimates = "  ".join(
+            f"{m}MB {lambda_ms(scrypt[n], m):7.1f}" for m in MEMORY_SIZES
+        )
+        print(
+            f"  N=2**{exponent:<3} local {scrypt[n]:7.1f} ms   Lambda est. {estimates}"
+        )
+
+    print(f"\nSCRYPT_N_BY_MEMORY for {args.target_ms:.0f} ms:")
+    for memory_mb, n in calibrate(scrypt, args.target_ms).items():
+        if n < password_hashing.MIN_SCRYPT_N:
+            # Clamped to the floor anyway, so it doesn't belong in the table
+            print(f"    # {memory_mb}: below MIN_SCRYPT_N, gets the floor")
+            continue
+        print(f"    {memory_mb}: 2**{n.bit_length() - 1},")
+
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        print("\nargon2-cffi not installed; skipping argon2")
+        return
+
+    argon = {}
+    print("\nargon2id (m=19 MiB, p=1)")
+    for time_cost in range(1, 7):
+        hasher = password_hashing.Argon2Hasher(time_cost=time_cost)
+        argon[time_cost] = median_ms(
+            lambda: hasher.hash("correct horse", "pepper"), args.runs
+        )
+        print(f"  t={time_cost}  local {argon[time_cost]:7.1f} ms")
+
+    print(f"\nargon2 time_cost for {args.target_ms:.0f} ms:")
+    for memory_mb, time_cost in calibrate(argon, args.target_ms).items():
+        print(f"    {memory_mb}: {time_cost},")
+
+
+if __name__ == "__main__":
+    main()
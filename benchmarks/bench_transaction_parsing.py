@@ -0,0 +1,175 @@
+"""
+Normalization benchmark for the Schwab transaction ingest on a synthetic export.
+
+Compares the original strptime/split/replace field parsing, the compiled and
+cached parsing in ingest_schwab_transactions, and a pandas batch conversion of
+the whole export, then times the full streaming path (export file -> table
+items, no DynamoDB). Run from the repo root:
+
+    python -m benchmarks.bench_transaction_parsing --rows 100000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LAMBDA_DIR = REPO_ROOT / "src" / "python" / "lambdas" / "ingest_lambda"
+
+sys.path.insert(0, str(LAMBDA_DIR))
+import ingest_schwab_transactions as ingest  # noqa: E402
+
+ACTIONS = ["Buy", "Sell", "Qualified Dividend", "Reinvest Shares", "Bank Interest"]
+SYMBOLS = ["MSTY", "MSTR", "IMST", "STRF", "STRK", ""]
+
+
+def synthetic_export(rows: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    days = pd.bdate_range(end="2025-09-30", periods=5 * 252).strftime("%m/%d/%Y")
+
+    transactions = []
+    for _ in range(rows):
+        posted = rng.choice(days)
+        if rng.random() < 0.1:
+            posted = f"{posted} as of {rng.choice(days)}"
+        price = rng.uniform(1, 500)
+        quantity = rng.randint(1, 5000)
+        transactions.append(
+            {
+                "Date": posted,
+                "Action": rng.choice(ACTIONS),
+                "Symbol": rng.choice(SYMBOLS),
+                "Description": "SYNTHETIC TRANSACTION",
+                "Quantity": f"{quantity:,}",
+                "Price": f"${price:,.2f}",
+                "Fees & Comm": rng.choice(["", "$0.65"]),
+                "Amount": f"-${price * quantity:,.2f}",
+            }
+        )
+
+    return {
+        "FromDate": days[0],
+        "ToDate": days[-1],
+        "TotalTransactionsAmount": "$0.00",
+        "BrokerageTransactions": transactions,
+    }
+
+
+def reference_normalize(txn: dict) -> tuple:
+    # Reference copy of the pre-regex parsing, kept for comparison only
+    def parse_date(date_str):
+        return datetime.strptime(date_str, "%m/%d/%Y").date().isoformat()
+
+    def parse_amount(value):
+        return Decimal(value.replace("$", "").replace(",", "")) if value else None
+
+    if "as of" in txn["Date"]:
+        effective = parse_date(txn["Date"].split("as of")[1].strip())
+        posted = parse_date(txn["Date"].split("as of")[0].strip())
+    else:
+        effective = parse_date(txn["Date"])
+        posted = effective
+
+    return (
+        posted,
+        effective,
+        parse_amount(txn["Price"]),
+        parse_amount(txn["Fees & Comm"]),
+        parse_amount(txn["Amount"]),
+    )
+
+
+def compiled_normalize(txn: dict) -> tuple:
+    posted, effective = ingest.parse_date_field(txn["Date"])
+    return (
+        posted,
+        effective,
+        ingest.parse_amount(txn["Price"]),
+        ingest.parse_amount(txn["Fees & Comm"]),
+        ingest.parse_amount(txn["Amount"]),
+    )
+
+
+def pandas_normalize(transactions: list[dict]) -> list[tuple]:
+    df = pd.DataFrame(transactions)
+    parts = df["Date"].str.extract(ingest.DATE_FIELD_RE.pattern)
+
+    def iso(month, day, year):
+        return pd.to_datetime(
+            year + "-" + month + "-" + day, format="%Y-%m-%d"
+        ).dt.strftime("%Y-%m-%d")
+
+    posted = iso(parts[0], parts[1], parts[2])
+    effective = iso(parts[3], parts[4], parts[5]).fillna(posted)
+    amounts = [
+        df[col]
+        .str.replace(r"[$,]", "", regex=True)
+        .map(lambda v: Decimal(v) if v else None)
+        for col in ["Price", "Fees & Comm", "Amount"]
+    ]
+    return list(zip(posted, effective, *amounts))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transaction parsing.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    export = synthetic_export(args.rows, args.seed)
+    transactions = export["BrokerageTransactions"]
+
+    reference, ref_s = timed(lambda: [reference_normalize(t) for t in transactions])
+    ingest.parse_date_field.cache_clear()
+    compiled, compiled_s = timed(lambda: [compiled_normalize(t) for t in transactions])
+    batched, pandas_s = timed(pandas_normalize, transactions)
+
+    if not reference == compiled == batched:
+        raise AssertionError("normalized fields differ between implementations")
+
+    print(f"Normalizing {args.rows:,} transactions")
+    for name, seconds in [
+        ("strptime + split", ref_s),
+        ("regex + cache", compiled_s),
+        ("pandas batch", pandas_s),
+    ]:
+        print(
+            f"  {name:18} {seconds * 1000:8.1f} ms  "
+            f"{args.rows / seconds:12,.0f} rows/s  {ref_s / seconds:5.1f}x"
+        )
+    print(f"  date cache: {ingest.parse_date_field.cache_info()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "export.json"
+        path.write_text(json.dumps(export))
+
+        ingest.parse_date_field.cache_clear()
+        with open(path, "rb") as f:
+            items, seconds = timed(
+                lambda: sum(
+                    1 for _ in ingest.iter_items(ingest.iter_export_transactions(f))
+                )
+            )
+
+    print(
+        f"Streaming export -> items: {items:,} items in {seconds:.2f}s "
+        f"({items / seconds:,.0f} items/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Local DynamoDB stand-ins for offline benchmarks.
+
+InMemoryTable mimics the slice of the boto3 Table API the ingestion code uses
+(put_item / batch_writer) and runs every item through the boto3 serializer so
+invalid types (floats, empty sets) fail the same way they would against AWS.
+moto_table() creates a real table inside moto when a closer match is needed.
+"""
+
+import os
+from contextlib import contextmanager
+
+from boto3.dynamodb.types import TypeSerializer
+
+_serializer = TypeSerializer()
+
+
+class InMemoryBatchWriter:
+    def __init__(self, table, overwrite_by_pkeys=None, flush_amount=25):
+        self._table = table
+        self._pkeys = overwrite_by_pkeys
+        self._flush_amount = flush_amount
+        self._buffer = []
+
+    def put_item(self, Item):
+        if self._pkeys:
+            # Same de-dup rule as boto3: a later put for a key replaces the earlier one
+            key = tuple(Item[k] for k in self._pkeys)
+            self._buffer = [
+                i for i in self._buffer if tuple(i[k] for k in self._pkeys) != key
+            ]
+        self._buffer.append(Item)
+        if len(self._buffer) >= self._flush_amount:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        for item in self._buffer:
+            self._table.put_item(Item=item)
+        self._table.batch_calls += 1
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._flush()
+
+
+class InMemoryTable:
+    def __init__(self, name: str, key_names=("PK", "SK")):
+        self.name = name
+        self.table_name = name
+        self.key_names = key_names
+        self.items = {}
+        self.put_calls = 0
+        self.batch_calls = 0
+
+    def put_item(self, Item, **kwargs):
+        # Serialize only to validate types, the plain item is what gets stored
+        for value in Item.values():
+            _serializer.serialize(value)
+        self.items[tuple(Item[k] for k in self.key_names)] = Item
+        self.put_calls += 1
+        return {}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return InMemoryBatchWriter(self, overwrite_by_pkeys=overwrite_by_pkeys)
+
+
+@contextmanager
+def moto_table(name: str, region: str = "us-east-1", indexes: dict = None):
+    """
+    Yields a PK/SK table created inside moto's mocked AWS account.
+    `indexes` adds string-keyed GSIs: {index name: (hash key, range key)}.
+    """
+    import boto3
+    from moto import mock_aws
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    indexes = indexes or {}
+    attributes = {"PK", "SK"} | {a for keys in indexes.values() for a in keys}
+    kwargs = {}
+    if indexes:
+        kwargs["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": index,
+                "KeySchema": [
+                    {"AttributeName": hash_key, "KeyType": "HASH"},
+                    {"AttributeName": range_key, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            for index, (hash_key, range_key) in indexes.items()
+        ]
+
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name=region)
+        table = dynamodb.create_table(
+            TableName=name,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": a, "AttributeType": "S"} for a in sorted(attributes)
+            ],
+            BillingMode="PAY_PER_REQUEST",
+            **kwargs,
+        )
+        yield table
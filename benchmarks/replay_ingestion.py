@@ -0,0 +1,307 @@
+"""
+Offline record/replay harness for the fetch_data_lambda ingestion pipeline.
+
+    # capture live Yahoo frames + issuer pages (writes go to an in-memory table)
+    python -m benchmarks.replay_ingestion record --fixtures benchmarks/fixtures/replay
+
+    # or build a synthetic fixture set from the saved HTML pages
+    python -m benchmarks.replay_ingestion synth --fixtures /tmp/replay --years 10
+
+    # run the real handler against the fixtures and report throughput
+    python -m benchmarks.replay_ingestion run --fixtures /tmp/replay --repeat 5 --profile
+
+Replay swaps the `requests` and `yfinance` modules the ingestion library imports
+on use, and its DynamoDB table for a local stand-in, so nothing leaves the
+machine.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+LAMBDA_DIR = REPO_ROOT / "src" / "python" / "lambdas" / "fetch_data_lambda"
+HTML_FIXTURES = Path(__file__).parent / "fixtures" / "html"
+
+sys.path.insert(0, str(LAMBDA_DIR))
+import fetch_data_lambda  # noqa: E402
+from ingestion import dynamo  # noqa: E402
+
+from benchmarks.local_dynamo import InMemoryTable, moto_table  # noqa: E402
+
+
+def url_to_filename(url: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", url).strip("_") + ".html"
+
+
+def read_manifest(fixture_dir: Path) -> dict:
+    return json.loads((fixture_dir / "manifest.json").read_text())
+
+
+def write_manifest(fixture_dir: Path, manifest: dict):
+    (fixture_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+
+def save_frame(fixture_dir: Path, ticker: str, df: pd.DataFrame) -> dict:
+    path = fixture_dir / "yahoo" / f"{ticker}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path)
+    return {"path": str(path.relative_to(fixture_dir)), "tz": str(df.index.tz)}
+
+
+def load_frame(fixture_dir: Path, entry: dict) -> pd.DataFrame:
+    df = pd.read_csv(fixture_dir / entry["path"], index_col="Date")
+    df.index = pd.to_datetime(df.index, utc=True).tz_convert(entry["tz"])
+    return df
+
+
+@contextlib.contextmanager
+def patched(module, **attrs):
+    saved = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+def use_table(table):
+    def init_env():
+        dynamo.HistoricalDataTable = table
+        dynamo.HistoricalDataTableName = table.table_name
+
+    return init_env
+
+
+class Recorder:
+    """
+    Passes calls through to requests / yfinance and saves every response.
+    """
+
+    def __init__(self, fixture_dir: Path):
+        import requests
+        import yfinance
+
+        self.fixture_dir = fixture_dir
+        self.manifest = {"http": {}, "yahoo": {}}
+        self._requests = requests
+        self._yf = yfinance
+
+    def get(self, url, *args, **kwargs):
+        response = self._requests.get(url, *args, **kwargs)
+        path = self.fixture_dir / "http" / url_to_filename(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(response.content)
+        self.manifest["http"][url] = str(path.relative_to(self.fixture_dir))
+        return response
+
+    def Ticker(self, ticker: str):
+        recorder, real = self, self._yf.Ticker(ticker)
+
+        class RecordingTicker:
+            def history(self, *args, **kwargs):
+                df = real.history(*args, **kwargs)
+                recorder.manifest["yahoo"][ticker] = save_frame(
+                    recorder.fixture_dir, ticker, df
+                )
+                return df
+
+        return RecordingTicker()
+
+
+class Replayer:
+    """
+    Serves recorded responses; everything is loaded up front so disk I/O stays
+    out of the timed section.
+    """
+
+    def __init__(self, fixture_dir: Path):
+        manifest = read_manifest(fixture_dir)
+        self.pages = {
+            url: (fixture_dir / path).read_bytes()
+            for url, path in manifest["http"].items()
+        }
+        self.frames = {
+            ticker: load_frame(fixture_dir, entry)
+            for ticker, entry in manifest["yahoo"].items()
+        }
+
+    def get(self, url, *args, **kwargs):
+        if url not in self.pages:
+            raise KeyError(f"No recorded response for {url}")
+        content = self.pages[url]
+        return SimpleNamespace(
+            status_code=200, content=content, text=content.decode("utf-8")
+        )
+
+    def Ticker(self, ticker: str):
+        frame = self.frames[ticker]
+        return SimpleNamespace(history=lambda *args, **kwargs: frame.copy())
+
+
+def count_items(table) -> int:
+    if isinstance(table, InMemoryTable):
+        return len(table.items)
+
+    total, kwargs = 0, {"Select": "COUNT"}
+    while True:
+        response = table.scan(**kwargs)
+        total += response["Count"]
+        if "LastEvaluatedKey" not in response:
+            return total
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def record(args):
+    fixture_dir = Path(args.fixtures)
+    recorder = Recorder(fixture_dir)
+    table = InMemoryTable(dynamo.HistoricalDataTableName)
+
+    with (
+        mock.patch.dict(sys.modules, requests=recorder, yfinance=recorder),
+        patched(fetch_data_lambda, init_env=use_table(table)),
+    ):
+        fetch_data_lambda.handler()
+
+    write_manifest(fixture_dir, recorder.manifest)
+    print(
+        f"✅ Recorded {len(recorder.manifest['http'])} pages and "
+        f"{len(recorder.manifest['yahoo'])} Yahoo frames to {fixture_dir}"
+    )
+
+
+def synth(args):
+    """
+    Builds a fixture set without network access: random-walk price frames for
+    every ticker the handler touches plus the saved issuer pages.
+    """
+    fixture_dir = Path(args.fixtures)
+    (fixture_dir / "http").mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    manifest = {"http": {}, "yahoo": {}}
+
+    pages = {
+        **{
+            f"https://www.yieldmaxetfs.com/our-etfs/{t}/": "yieldmax_msty.html"
+            for t in fetch_data_lambda.YMTickers
+        },
+        **{
+            url: "bitwise_imst.html"
+            for url in fetch_data_lambda.BitWiseTickers.values()
+        },
+    }
+    for url, page in pages.items():
+        target = fixture_dir / "http" / url_to_filename(url)
+        shutil.copyfile(HTML_FIXTURES / page, target)
+        manifest["http"][url] = str(target.relative_to(fixture_dir))
+
+    tickers = (
+        fetch_data_lambda.YMTickers + list(fetch_data_lambda.BitWiseTickers) + ["MSTR"]
+    )
+    dates = pd.bdate_range(end="2025-09-30", periods=int(args.years * 252))
+    dates = dates.tz_localize("America/New_York")
+    for ticker in tickers:
+        close = 20 * np.exp(np.cumsum(rng.normal(0, 0.03, len(dates))))
+        df = pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0, 0.01, len(dates))),
+                "High": close * 1.02,
+                "Low": close * 0.98,
+                "Close": close,
+                "Adj Close": close,
+                "Volume": rng.integers(1e5, 1e7, len(dates)),
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+                "Capital Gains": 0.0,
+            },
+            index=pd.Index(dates, name="Date"),
+        )
+        manifest["yahoo"][ticker] = save_frame(fixture_dir, ticker, df)
+
+    write_manifest(fixture_dir, manifest)
+    print(f"✅ Wrote synthetic fixtures for {', '.join(tickers)} to {fixture_dir}")
+
+
+def run(args):
+    replayer = Replayer(Path(args.fixtures))
+    table_ctx = (
+        moto_table(dynamo.HistoricalDataTableName)
+        if args.dynamo == "moto"
+        else contextlib.nullcontext(InMemoryTable(dynamo.HistoricalDataTableName))
+    )
+    profiler = cProfile.Profile() if args.profile else None
+    timings = []
+
+    with (
+        table_ctx as table,
+        mock.patch.dict(sys.modules, requests=replayer, yfinance=replayer),
+        patched(fetch_data_lambda, init_env=use_table(table)),
+    ):
+        for _ in range(args.repeat):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else out):
+                if profiler:
+                    profiler.enable()
+                start = time.perf_counter()
+                fetch_data_lambda.handler()
+                timings.append(time.perf_counter() - start)
+                if profiler:
+                    profiler.disable()
+        items = count_items(table)
+
+    best, mean = min(timings), sum(timings) / len(timings)
+    print(f"Runs: {len(timings)}  table: {args.dynamo}  items per run: {items}")
+    print(
+        f"Best: {best:.3f}s  Mean: {mean:.3f}s  Throughput: {items / mean:,.0f} items/s"
+    )
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record and replay fetch_data_lambda ingestion offline."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Capture live responses to fixtures")
+    rec.add_argument("--fixtures", default="benchmarks/fixtures/replay")
+    rec.set_defaults(func=record)
+
+    syn = sub.add_parser("synth", help="Generate a synthetic fixture set")
+    syn.add_argument("--fixtures", default="benchmarks/fixtures/replay")
+    syn.add_argument("--years", type=float, default=5, help="Years of daily bars")
+    syn.add_argument("--seed", type=int, default=7)
+    syn.set_defaults(func=synth)
+
+    rep = sub.add_parser("run", help="Replay fixtures through the handler")
+    rep.add_argument("--fixtures", default="benchmarks/fixtures/replay")
+    rep.add_argument("--repeat", type=int, default=3)
+    rep.add_argument("--dynamo", choices=["memory", "moto"], default="memory")
+    rep.add_argument("--profile", action="store_true", help="Print cProfile stats")
+    rep.add_argument("--top", type=int, default=25, help="Profile rows to print")
+    rep.add_argument("--verbose", action="store_true", help="Show handler output")
+    rep.set_defaults(func=run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,9 @@ import matplotlib.pyplot as plt
 import pandas as pd
 from matplotlib.widgets import Cursor
 
+from utils.covered_call import simulate_covered_calls
 from utils.taxes import monthly_federal_tax
+from utils.vol_surface import load_surface
 
 locale.setlocale(locale.LC_ALL, "")
 from jprint import jprint
@@ -107,6 +109,29 @@ bull_std_dev_decay = 0.05
 bear_mean_decay = 0.07  # Bear: -7% average monthly NAV decay
 bear_std_dev_decay = 0.10
 
+# Optional pasted MSTR chain (see options_pricing.py). When set, the decay std
+# devs above are scaled each month by the surface's forward vol for that month
+# relative to the first month's.
+vol_surface_chain = None
+vol_surface_spot = None  # MSTR price the chain was captured at
+vol_surface = (
+    load_surface(vol_surface_chain, vol_surface_spot) if vol_surface_chain else None
+)
+decay_vol_scale = (
+    vol_surface.decay_vol_scale(months) if vol_surface else (1.0,) * months
+)
+
+# "gaussian": decay and yield are drawn from the regime parameters above.
+# "covered_call": both come from simulated MSTR paths and the premium of the
+# monthly call MSTY sells (utils/covered_call.py), priced for every epoch up
+# front; the MSTY regime then follows the covered-call model's regimes.
+distribution_model = "gaussian"
+if distribution_model == "covered_call":
+    covered_calls = simulate_covered_calls(epochs, months, surface=vol_surface)
+    cc_decay = covered_calls["decay"].tolist()
+    cc_dist_yield = covered_calls["dist_yield"].tolist()
+    cc_bull = covered_calls["bull"].tolist()
+
 
 # === Draw Tiers ===
 # Each tuple is (draw amount, min revenue, max revenue). Used to determine income draw based on revenue.
@@ -165,7 +190,7 @@ avg_results = {}
 fails = 0
 successes = 0
 fail_months = []  # Track the month of each fail
-for _ in range(epochs):
+for epoch in range(epochs):
     msty_price = 20.59
     msty_shares = starting_capital_contributed / msty_price
     loan_balance = 0
@@ -215,6 +240,9 @@ for _ in range(epochs):
         #     if random.random() < bear_to_bull_prob:
         #         regime = "bull"
 
+        if distribution_model == "covered_call":
+            regime = "bull" if cc_bull[epoch][month - 1] else "bear"
+
         # MSTY NAV decay based on MSTY regime
         if regime == "bull":
             mean_decay = bull_mean_decay
@@ -222,6 +250,7 @@ for _ in range(epochs):
         else:
             mean_decay = bear_mean_decay
             std_dev_decay = bear_std_dev_decay
+        std_dev_decay *= decay_vol_scale[month - 1]
 
         # --- BTC Regime Switching (independent!) ---
         if btc_regime == "bull":
@@ -251,11 +280,15 @@ for _ in range(epochs):
         btc_price *= 1 + btc_monthly_growth
 
         # Calculate the modelled NAV decay and distribution yield
-        decay = random.gauss(mean_decay, std_dev_decay)
-        decay = max(decay_low, min(decay, decay_high))
-        dy = random.gauss(mean_yield, std_dev_yield)  # distribution yield
-        dy *= 1 - decay * 0.8  # nav decay amplifies yield
-        dy = max(dist_yield_low, min(dy, dist_yield_high))  # cap yield
+        if distribution_model == "covered_call":
+            decay = cc_decay[epoch][month - 1]
+            dy = cc_dist_yield[epoch][month - 1]
+        else:
+            decay = random.gauss(mean_decay, std_dev_decay)
+            decay = max(decay_low, min(decay, decay_high))
+            dy = random.gauss(mean_yield, std_dev_yield)  # distribution yield
+            dy *= 1 - decay * 0.8  # nav decay amplifies yield
+            dy = max(dist_yield_low, min(dy, dist_yield_high))  # cap yield
         msty_price *= 1 - decay
         msty_price_history.append(msty_price)
         if len(msty_price_history) > risk_look_back_months:
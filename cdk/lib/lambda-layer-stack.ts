@@ -11,6 +11,7 @@ interface LambdaLayerStackProps extends StackProps {
 
 export class LambdaLayerStack extends Stack {
   public readonly common: pythonLambda.PythonLayerVersion
+  public readonly ingestion: lambda.LayerVersion
 
   constructor(scope: Construct, id: string, props: LambdaLayerStackProps) {
     super(scope, id, props)
@@ -38,5 +39,24 @@ export class LambdaLayerStack extends Stack {
         ],
       },
     })
+
+    // Shared price/distribution ingestion library (src/python/ingestion).
+    // Third-party deps come from the common layer.
+    this.ingestion = new lambda.LayerVersion(this, `${ENV_NAME}-ingestion_v1`, {
+      layerVersionName: `${ENV_NAME}-ingestion_v1`,
+      code: lambda.Code.fromAsset(path.join(__dirname, '../../src/python'), {
+        exclude: ['*', '!ingestion', '!ingestion/**', '**/__pycache__'],
+        bundling: {
+          image: lambda.Runtime.PYTHON_3_12.bundlingImage,
+          command: [
+            'bash',
+            '-c',
+            'mkdir -p /asset-output/python && cp -r ingestion /asset-output/python/',
+          ],
+        },
+      }),
+      compatibleRuntimes: [lambda.Runtime.PYTHON_3_12],
+      description: 'Shared price and distribution ingestion library',
+    })
   }
 }
@@ -9,6 +9,8 @@ import * as targets from 'aws-cdk-lib/aws-events-targets'
 import { PythonFunction } from '@aws-cdk/aws-lambda-python-alpha'
 import { LambdaLayerStack } from '../lib/lambda-layer-stack'
 import * as sqs from 'aws-cdk-lib/aws-sqs'
+import * as s3 from 'aws-cdk-lib/aws-s3'
+import { DynamoEventSource, S3EventSource } from 'aws-cdk-lib/aws-lambda-event-sources'
 
 interface LambdasProps {
   env: {
@@ -27,7 +29,10 @@ export class Lambdas {
   public readonly fetchDataLambda: lambda.Function
   public readonly fetchStrategyKPIs: lambda.Function
   public readonly ingestLambda: lambda.Function
+  public readonly ingestExportsLambda: lambda.Function
+  public readonly transactionExportsBucket: s3.Bucket
   public readonly userService: lambda.Function
+  public readonly emailWorker: lambda.Function
 
   constructor(scope: Construct, id: string, props: LambdasProps) {
     const { ENV_NAME, ENV_TYPE, tables, logRetention, env, layers } = props
@@ -71,6 +76,45 @@ export class Lambdas {
     })
     tables.userService.grantReadWriteData(this.userService)
 
+    // Sends confirmation emails written to the UserService outbox by signup
+    this.emailWorker = new PythonFunction(scope, `${ENV_NAME}-emailWorker`, {
+      functionName: `${ENV_NAME}-emailWorker`,
+      runtime: lambda.Runtime.PYTHON_3_12,
+      memorySize: 256,
+      timeout: cdk.Duration.seconds(30),
+      architecture: lambda.Architecture.ARM_64,
+      entry: '../src/python/lambdas/userservice',
+      index: 'email_worker.py',
+      handler: 'handler',
+      logRetention,
+      environment,
+      role: lambdaRole,
+      layers: [layers.common],
+    })
+    tables.userService.grantReadWriteData(this.emailWorker)
+    this.emailWorker.addToRolePolicy(
+      new iam.PolicyStatement({
+        actions: ['ses:SendRawEmail'],
+        resources: ['*'],
+      }),
+    )
+    this.emailWorker.addEventSource(
+      new DynamoEventSource(tables.userService, {
+        startingPosition: lambda.StartingPosition.LATEST,
+        batchSize: 25,
+        maxBatchingWindow: cdk.Duration.seconds(1),
+        retryAttempts: 5,
+        bisectBatchOnError: true,
+        reportBatchItemFailures: true,
+        filters: [
+          lambda.FilterCriteria.filter({
+            eventName: lambda.FilterRule.isEqual('INSERT'),
+            dynamodb: { Keys: { PK: { S: lambda.FilterRule.beginsWith('OUTBOX#') } } },
+          }),
+        ],
+      }),
+    )
+
     this.ingestLambda = new PythonFunction(scope, `${ENV_NAME}-IngestLambda`, {
       functionName: `${ENV_NAME}-IngestLambda`,
       runtime: lambda.Runtime.PYTHON_3_12,
@@ -87,6 +131,37 @@ export class Lambdas {
     })
     tables.TxnTable.grantReadWriteData(this.ingestLambda)
 
+    // Schwab exports dropped here are streamed into Transactions, so large
+    // account histories never pass through the 6 MB invoke payload
+    this.transactionExportsBucket = new s3.Bucket(scope, `${ENV_NAME}-TransactionExports`, {
+      removalPolicy: cdk.RemovalPolicy.RETAIN,
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      enforceSSL: true,
+    })
+
+    this.ingestExportsLambda = new PythonFunction(scope, `${ENV_NAME}-IngestExportsLambda`, {
+      functionName: `${ENV_NAME}-IngestExportsLambda`,
+      runtime: lambda.Runtime.PYTHON_3_12,
+      memorySize: 512,
+      timeout: cdk.Duration.minutes(5),
+      architecture: lambda.Architecture.ARM_64,
+      entry: '../src/python/lambdas/ingest_lambda',
+      index: 'ingest_schwab_transactions.py',
+      handler: 's3_handler',
+      logRetention,
+      environment,
+      role: lambdaRole,
+      layers: [layers.common],
+    })
+    tables.TxnTable.grantReadWriteData(this.ingestExportsLambda)
+    this.transactionExportsBucket.grantRead(this.ingestExportsLambda)
+    this.ingestExportsLambda.addEventSource(
+      new S3EventSource(this.transactionExportsBucket, {
+        events: [s3.EventType.OBJECT_CREATED],
+        filters: [{ suffix: '.json' }],
+      }),
+    )
+
     this.fetchDataLambda = new PythonFunction(scope, `${ENV_NAME}-FetchDataLambda`, {
       functionName: `${ENV_NAME}-FetchDataLambda`,
       runtime: lambda.Runtime.PYTHON_3_12,
@@ -99,7 +174,7 @@ export class Lambdas {
       logRetention,
       environment,
       role: lambdaRole,
-      layers: [layers.common],
+      layers: [layers.common, layers.ingestion],
     })
 
     tables.historicalDataTable.grantReadWriteData(this.fetchDataLambda)
@@ -116,7 +191,7 @@ export class Lambdas {
       logRetention,
       environment,
       role: lambdaRole,
-      layers: [layers.common],
+      layers: [layers.common, layers.ingestion],
     })
 
     tables.mstrKpiTable.grantReadWriteData(this.fetchStrategyKPIs)
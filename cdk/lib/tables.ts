@@ -32,11 +32,21 @@ export class TablesStack extends Stack {
       },
     })
 
+    // New rows by ingest time, so the position ledger never scans the table
+    this.TxnTable.addGlobalSecondaryIndex({
+      indexName: 'ingested-index',
+      partitionKey: { name: 'Source', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'IngestedAt', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.ALL,
+    })
+
     this.userService = new dynamodb.Table(this, `${ENV_NAME}-UserService`, {
       tableName: `${ENV_NAME}-UserService`,
       partitionKey: { name: 'PK', type: dynamodb.AttributeType.STRING },
       sortKey: { name: 'SK', type: dynamodb.AttributeType.STRING },
       billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      // Feeds OUTBOX# items to the email worker
+      stream: dynamodb.StreamViewType.NEW_IMAGE,
       removalPolicy: dynamoRemovalPolicy,
       pointInTimeRecoverySpecification: {
         pointInTimeRecoveryEnabled: pointInTimeRecovery,
@@ -1,17 +1,32 @@
+import argparse
+import os
+import sys
 from datetime import datetime
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import requests
-from sklearn.linear_model import LinearRegression
 
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "python")
+)
 
-def get_nasdaq_history(ticker):
+from ingestion.nav_analytics import (  # noqa: E402
+    DEFAULT_WINDOW,
+    analyze,
+    analyze_all,
+    load_distributions,
+    summarize,
+)
+from ingestion.price_cache import DEFAULT_START, load_prices  # noqa: E402
+
+
+def get_nasdaq_history(ticker, start=DEFAULT_START):
     today = datetime.now().strftime("%Y-%m-%d")
     url = (
         f"https://api.nasdaq.com/api/quote/{ticker}/historical"
-        f"?assetclass=etf&fromdate=2015-06-19&todate={today}&limit=9999"
+        f"?assetclass=etf&fromdate={start}&todate={today}&limit=9999"
     )
     headers = {
         "User-Agent": "Mozilla/5.0",
@@ -21,26 +36,27 @@ def get_nasdaq_history(ticker):
     r = requests.get(url, headers=headers)
     if r.status_code != 200:
         raise RuntimeError(f"Failed to fetch data: {r.status_code}")
-    rows = r.json()["data"]["tradesTable"]["rows"]
+    rows = (r.json().get("data") or {}).get("tradesTable", {}).get("rows") or []
+    if not rows:
+        return pd.DataFrame(columns=["date", "close"])
     df = pd.DataFrame(rows)
     df["date"] = pd.to_datetime(df["date"]).dt.tz_localize(None)
-    df["close"] = pd.to_numeric(df["close"].str.replace(",", ""))
+    df["close"] = pd.to_numeric(df["close"].str.replace(r"[$,]", "", regex=True))
     df = df.sort_values("date")
     return df[["date", "close"]]
 
 
-def plot_nav_trend(prices, years_forward=3):
-    df = prices.copy()
+def plot_nav_trend(ticker, prices, dists, years_forward=3, window=DEFAULT_WINDOW):
+    df = analyze(prices, dists, window)
     df["months"] = (df["date"] - df["date"].min()).dt.days / 30.44
-    X = df["months"].values.reshape(-1, 1)
-    y = df["close"].values
+    months = df["months"].to_numpy()
+    y = df["close"].to_numpy()
 
-    model = LinearRegression().fit(X, y)
-    trend = model.predict(X)
-    r2 = model.score(X, y)
-
-    slope = model.coef_[0]
-    intercept = model.intercept_
+    # Straight-line fit of close on calendar months, as before
+    slope, intercept = np.polyfit(months, y, 1)
+    trend = intercept + slope * months
+    r2 = 1 - ((y - trend) ** 2).sum() / ((y - y.mean()) ** 2).sum()
+    summary = summarize(ticker, df)
 
     print("\n=== Price Summary ===")
     print(df["close"].describe())
@@ -52,6 +68,17 @@ def plot_nav_trend(prices, years_forward=3):
         f"Start Price: {df['close'].iloc[0]:.2f}, End Price: {df['close'].iloc[-1]:.2f}"
     )
     print(f"Observed Duration: {df['months'].iloc[-1]:.2f} months")
+    print(
+        f"Distributions: {summary['distributions']}, TTM Yield: {summary['ttm_yield']:.2%}"
+    )
+    print(
+        f"Price Return: {summary['price_return']:.2%}, "
+        f"Total Return: {summary['total_return']:.2%}"
+    )
+    print(
+        f"{window}-Day Trend: price {summary['recent_price_trend']:.2%}/yr, "
+        f"total {summary['recent_total_trend']:.2%}/yr"
+    )
 
     # === Rolling 30-Day Mean ===
     df["rolling30"] = df["close"].rolling(window=30).mean()
@@ -63,12 +90,18 @@ def plot_nav_trend(prices, years_forward=3):
     future_dates = [
         df["date"].max() + pd.DateOffset(months=i) for i in range(1, months_future + 1)
     ]
-    future_trend = model.predict(future_months.reshape(-1, 1))
+    future_trend = intercept + slope * future_months
 
     # === Plot NAV trend ===
     plt.figure(figsize=(14, 6))
     plt.plot(df["date"], df["close"], "bo", markersize=3, label="Close Price")
     plt.plot(df["date"], df["rolling30"], "k-", label="30-Day Rolling Avg")
+    plt.plot(
+        df["date"],
+        df["close"].iloc[0] * df["total_index"],
+        "m-",
+        label="Total Return (distributions reinvested)",
+    )
     plt.plot(df["date"], trend, "r--", label=f"Trendline (R²={r2:.3f})")
     plt.plot(
         future_dates,
@@ -85,6 +118,18 @@ def plot_nav_trend(prices, years_forward=3):
     plt.tight_layout()
     plt.show()
 
+    # === Rolling annualized trends ===
+    plt.figure(figsize=(14, 4))
+    plt.plot(df["date"], df["price_trend"] * 100, "b-", label="Price")
+    plt.plot(df["date"], df["total_trend"] * 100, "m-", label="Total Return")
+    plt.axhline(0, color="black", linewidth=0.8)
+    plt.title(f"{ticker} {window}-Day Rolling Trend (annualized)")
+    plt.ylabel("%/yr")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
     # === Histogram of Close Prices ===
     plt.figure(figsize=(10, 4))
     df["close"].hist(bins=25, edgecolor="black")
@@ -95,13 +140,71 @@ def plot_nav_trend(prices, years_forward=3):
     plt.show()
 
 
-if __name__ == "__main__":
-    import sys
+def print_summary(summary):
+    percent = [
+        "price_return",
+        "total_return",
+        "price_cagr",
+        "total_cagr",
+        "ttm_yield",
+        "price_trend",
+        "recent_price_trend",
+        "recent_total_trend",
+    ]
+    table = summary.copy()
+    for column in percent:
+        table[column] = table[column].map(lambda v: f"{v:.1%}")
+    table["close"] = table["close"].map(lambda v: f"{v:.2f}")
+    table["trend_r2"] = table["trend_r2"].map(lambda v: f"{v:.2f}")
+    print(table.to_string(index=False))
 
-    ticker = sys.argv[1] if len(sys.argv) > 1 else "MSTY"
-    print(f"Fetching price history for {ticker}...")
-    prices = get_nasdaq_history(ticker)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NAV trendline and projection.")
+    parser.add_argument("ticker", nargs="?", default="MSTY")
+    parser.add_argument(
+        "--offline", action="store_true", help="use the local price cache only"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="ignore the cache and refetch"
+    )
+    parser.add_argument(
+        "--no-dynamo", action="store_true", help="skip HistoricalData PRICE# rows"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_WINDOW,
+        help="trading days in the rolling trend window",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="summarize every YieldMax/Bitwise ticker instead of plotting one",
+    )
+    args = parser.parse_args()
+
+    if args.all:
+        print("Analyzing all tickers...")
+        summary, _ = analyze_all(
+            window=args.window, fetch=get_nasdaq_history, offline=args.offline
+        )
+        print_summary(summary)
+        sys.exit(0)
+
+    ticker = args.ticker
+    print(f"Loading price history for {ticker}...")
+    prices = load_prices(
+        ticker,
+        fetch=get_nasdaq_history,
+        use_dynamo=not args.no_dynamo,
+        offline=args.offline,
+        refresh=args.refresh,
+    )
+    prices = prices[["date", "close"]]
     print(prices.tail())
 
+    dists = load_distributions(ticker, offline=args.offline or args.no_dynamo)
+
     print("Plotting NAV trend and projection...")
-    plot_nav_trend(prices, years_forward=3)
+    plot_nav_trend(ticker, prices, dists, years_forward=3, window=args.window)
@@ -16,6 +16,9 @@ class GameState:
         self.net_cash = 0.0
         self.extra_draw = 0.0
         self.extra_loan = 0.0
+        # (decay, dist yield, bull) per month when distribution_model is
+        # "covered_call"; filled by utils.simulation.covered_call_month
+        self.covered_call_path = []
 
     def snapshot(self):
         return {
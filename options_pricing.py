@@ -1,15 +1,31 @@
 #!/usr/bin/env python3
+"""
+Options chain screener.
+
+Loads a chain pasted from the broker (an expiry line such as "Jul. 18, 2025"
+followed by one 15-column row per strike, calls on the left) into a typed
+columnar table, then prices every contract in one vectorized pass:
+Black-Scholes implied vol from the mid, delta/gamma/theta/vega, and the
+annualized yield of selling at the bid.
+
+    python options_pricing.py chain.txt --spot 412.50
+    python options_pricing.py chain.txt --ticker MSTR      # spot from yfinance
+    python options_pricing.py chain.txt --spot 412.50 --moneyness 0.8 1.2
+    python options_pricing.py chain.txt --spot 412.50 --format csv > chain.csv
+"""
+
+import argparse
+import re
 import sys
-import csv
-from collections import defaultdict
-from rich.table import Table
-from rich.console import Console
-from rich import box
+from datetime import date, datetime
 
-console = Console()
-input_file = sys.argv[1]
+import numpy as np
+import pandas as pd
+from rich.console import Console
 
-UNDERLYING_PRICE = 54.30  # ← Update this manually for now
+RISK_FREE_RATE = 0.045
+DIVIDEND_YIELD = 0.0
+DAYS_PER_YEAR = 365.0
 
 HEADERS = [
     "Call_Bid",
@@ -29,64 +45,485 @@ HEADERS = [
     "Put_Delta",
 ]
 
-options_by_expiry = defaultdict(list)
-current_expiry = ""
+MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+# "Jul. 18, 2025", "Sept 19 2025", "Friday, Dec. 19, 2025"; the year is optional
+EXPIRY_RE = re.compile(
+    r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+"
+    r"(\d{1,2})(?:,?\s+(\d{4}))?\b",
+    re.IGNORECASE,
+)
+SKIP_PREFIXES = ("More", "Select")
+
+# Broker placeholders for an empty cell
+MISSING = {"-", "--", "N/A", "n/a", ""}
+
+
+def parse_expiry(line: str, today: date | None = None) -> date | None:
+    match = EXPIRY_RE.search(line)
+    if not match:
+        return None
+    month = MONTHS[match.group(1).lower()]
+    day = int(match.group(2))
+    if match.group(3):
+        return date(int(match.group(3)), month, day)
 
-with open(input_file, "r") as f:
-    for line in f:
+    # No year: the next occurrence on or after today
+    today = today or date.today()
+    expiry = date(today.year, month, day)
+    return expiry if expiry >= today else date(today.year + 1, month, day)
+
+
+def load_chain(lines, today: date | None = None) -> pd.DataFrame:
+    """
+    One row per (expiry, strike) with the HEADERS columns as float64 (missing
+    cells are NaN) plus an Expiry date column. Rows before the first expiry
+    line, or under an expiry that isn't a real date, are dropped.
+    """
+    rows, expiries = [], []
+    current_expiry = None
+
+    for line in lines:
         stripped = line.strip()
-        if not stripped or stripped.startswith("More") or stripped.startswith("Select"):
-            continue
-        if any(month in stripped for month in ["Jul.", "Aug.", "Sep."]):
-            current_expiry = stripped
+        if not stripped or stripped.startswith(SKIP_PREFIXES):
             continue
         fields = stripped.split()
-        if len(fields) == 15:
-            options_by_expiry[current_expiry].append(fields)
+        if len(fields) == len(HEADERS) and current_expiry is not None:
+            rows.append(fields)
+            expiries.append(current_expiry)
+            continue
+        try:
+            expiry = parse_expiry(stripped, today)
+        except ValueError as e:
+            # e.g. "Feb. 30": drop that expiry's rows, not the whole chain
+            print(f"⚠️ Skipping expiry '{stripped}': {e}")
+            current_expiry = None
+            continue
+        if expiry is not None:
+            current_expiry = expiry
+
+    raw = pd.DataFrame(rows, columns=HEADERS, dtype=str)
+    chain = pd.DataFrame(
+        {
+            column: pd.to_numeric(
+                raw[column]
+                .str.replace(",", "", regex=False)
+                .str.rstrip("%")
+                .where(~raw[column].isin(MISSING)),
+                errors="coerce",
+            ).astype("float64")
+            for column in HEADERS
+        }
+    )
+    chain.insert(0, "Expiry", pd.to_datetime(pd.Series(expiries, dtype=object)))
+    return chain
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    # Zelen & Severo (Abramowitz & Stegun 26.2.17), |error| < 7.5e-8
+    t = 1.0 / (1.0 + 0.2316419 * np.abs(x))
+    poly = t * (
+        0.319381530
+        + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429)))
+    )
+    upper = norm_pdf(x) * poly
+    return np.where(x >= 0, 1.0 - upper, upper)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def _d1_d2(spot, strike, t, rate, div_yield, vol):
+    vol_sqrt_t = vol * np.sqrt(t)
+    d1 = (np.log(spot / strike) + (rate - div_yield + 0.5 * vol * vol) * t) / (
+        vol_sqrt_t
+    )
+    return d1, d1 - vol_sqrt_t
+
+
+def bs_price(spot, strike, t, vol, is_call, rate=RISK_FREE_RATE, div_yield=0.0):
+    d1, d2 = _d1_d2(spot, strike, t, rate, div_yield, vol)
+    disc_spot = spot * np.exp(-div_yield * t)
+    disc_strike = strike * np.exp(-rate * t)
+    call = disc_spot * norm_cdf(d1) - disc_strike * norm_cdf(d2)
+    put = disc_strike * norm_cdf(-d2) - disc_spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_vega(spot, strike, t, vol, rate=RISK_FREE_RATE, div_yield=0.0):
+    d1, _ = _d1_d2(spot, strike, t, rate, div_yield, vol)
+    return spot * np.exp(-div_yield * t) * norm_pdf(d1) * np.sqrt(t)
+
+
+def implied_vol(
+    price,
+    spot,
+    strike,
+    t,
+    is_call,
+    rate=RISK_FREE_RATE,
+    div_yield=0.0,
+    tol=1e-6,
+    max_iter=50,
+):
+    """
+    Newton-Raphson on the whole array at once, kept inside a per-contract
+    [lo, hi] bracket that falls back to bisection when a Newton step leaves
+    it (deep ITM/OTM contracts with almost no vega). A contract is solved
+    when its model price is within `tol` of its price, relatively, or the
+    bracket has closed around the vol. Prices outside the no-arbitrage
+    bounds, with no time left, or not solved in `max_iter` steps come back
+    as NaN.
+    """
+    price, spot, strike, t = np.broadcast_arrays(
+        *(np.asarray(a, dtype="float64") for a in (price, spot, strike, t))
+    )
+    is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), price.shape)
+
+    disc_spot = spot * np.exp(-div_yield * t)
+    disc_strike = strike * np.exp(-rate * t)
+    lower = np.where(
+        is_call,
+        np.maximum(disc_spot - disc_strike, 0.0),
+        np.maximum(disc_strike - disc_spot, 0.0),
+    )
+    upper = np.where(is_call, disc_spot, disc_strike)
+    valid = (t > 0) & (price > lower) & (price < upper)
+
+    lo = np.full(price.shape, 1e-4)
+    hi = np.full(price.shape, 10.0)
+    # Brenner-Subrahmanyam starting point, clipped into the bracket
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = np.clip(np.sqrt(2 * np.pi / t) * price / spot, 0.05, 3.0)
+    vol = np.where(valid, vol, 0.5)
+    t_safe = np.where(valid, t, 1.0)
+
+    active = valid.copy()
+    solved = np.zeros(price.shape, dtype=bool)
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        diff = bs_price(spot, strike, t_safe, vol, is_call, rate, div_yield) - price
+        # Relative, so cheap far-OTM contracts are solved rather than waved
+        # through on the starting guess
+        done = active & (np.abs(diff) <= tol * price)
+        solved |= done
+        active &= ~done
+        hi = np.where(active & (diff > 0), vol, hi)
+        lo = np.where(active & (diff < 0), vol, lo)
+        vega = bs_vega(spot, strike, t_safe, vol, rate, div_yield)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = vol - diff / vega
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        vol = np.where(active, np.where(inside, newton, 0.5 * (lo + hi)), vol)
+
+        closed = active & (hi - lo <= tol * vol)
+        solved |= closed
+        active &= ~closed
+
+    return np.where(solved, vol, np.nan)
+
+
+def greeks(spot, strike, t, vol, is_call, rate=RISK_FREE_RATE, div_yield=0.0):
+    """
+    Delta, gamma, theta per calendar day, and vega per 1 vol point.
+    """
+    d1, d2 = _d1_d2(spot, strike, t, rate, div_yield, vol)
+    sqrt_t = np.sqrt(t)
+    disc_q = np.exp(-div_yield * t)
+    disc_r = np.exp(-rate * t)
+    pdf_d1 = norm_pdf(d1)
+
+    delta = np.where(is_call, disc_q * norm_cdf(d1), disc_q * (norm_cdf(d1) - 1.0))
+    gamma = disc_q * pdf_d1 / (spot * vol * sqrt_t)
+    decay = -spot * disc_q * pdf_d1 * vol / (2.0 * sqrt_t)
+    call_theta = (
+        decay
+        - rate * strike * disc_r * norm_cdf(d2)
+        + div_yield * spot * disc_q * norm_cdf(d1)
+    )
+    put_theta = (
+        decay
+        + rate * strike * disc_r * norm_cdf(-d2)
+        - div_yield * spot * disc_q * norm_cdf(-d1)
+    )
+    theta = np.where(is_call, call_theta, put_theta) / DAYS_PER_YEAR
+    vega = spot * disc_q * pdf_d1 * sqrt_t / 100.0
+    return {"Delta": delta, "Gamma": gamma, "Theta": theta, "Vega": vega}
+
+
+def price_chain(
+    chain: pd.DataFrame,
+    spot: float,
+    as_of: datetime | None = None,
+    rate: float = RISK_FREE_RATE,
+    div_yield: float = DIVIDEND_YIELD,
+) -> pd.DataFrame:
+    """
+    Adds DTE, Moneyness (strike / spot) and, for each side, Mid, IV, Delta,
+    Gamma, Theta, Vega and Yield: the bid's extrinsic value (bid - intrinsic,
+    floored at 0) as an annualized return on the capital tied up (spot for a
+    covered call, strike for a cash-secured put). Intrinsic value is only
+    the stock changing hands, so ITM premiums don't count as yield.
+    Every contract in every expiry is priced in the same NumPy pass.
+    """
+    as_of = pd.Timestamp(as_of or datetime.now())
+    # Contracts stop trading at the 16:00 close on expiry day
+    expires_at = chain["Expiry"] + pd.Timedelta(hours=16)
+    days = (expires_at - as_of).dt.total_seconds().to_numpy() / 86400.0
+
+    priced = chain.copy()
+    priced["DTE"] = np.ceil(days).clip(min=0)
+    priced["Moneyness"] = priced["Strike"] / spot
+
+    n = len(chain)
+    strike = np.tile(chain["Strike"].to_numpy(), 2)
+    side_days = np.tile(days, 2)
+    t = side_days / DAYS_PER_YEAR
+    is_call = np.repeat([True, False], n)
+    bid = np.concatenate([chain["Call_Bid"].to_numpy(), chain["Put_Bid"].to_numpy()])
+    ask = np.concatenate([chain["Call_Ask"].to_numpy(), chain["Put_Ask"].to_numpy()])
+    mid = np.where((bid > 0) & (ask >= bid), 0.5 * (bid + ask), np.nan)
+
+    vol = implied_vol(mid, spot, strike, t, is_call, rate, div_yield)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sens = greeks(spot, strike, t, vol, is_call, rate, div_yield)
+        capital = np.where(is_call, spot, strike)
+        intrinsic = np.maximum(np.where(is_call, spot - strike, strike - spot), 0.0)
+        extrinsic = np.maximum(bid - intrinsic, 0.0)
+        yield_ = (
+            extrinsic
+            / capital
+            * DAYS_PER_YEAR
+            / np.where(side_days > 0, side_days, np.nan)
+        )
+
+    columns = {"Mid": mid, "IV": vol, **sens, "Yield": yield_}
+    for side, rows in (("Call", slice(0, n)), ("Put", slice(n, 2 * n))):
+        for name, values in columns.items():
+            priced[f"{side}_{name}"] = values[rows]
+    return priced
+
+
+def spot_from_yfinance(ticker: str) -> float:
+    import yfinance as yf
+
+    return float(yf.Ticker(ticker).history(period="1d")["Close"].iloc[-1])
+
+
+DISPLAY = [
+    ("Call_Bid", "{:.2f}"),
+    ("Call_Ask", "{:.2f}"),
+    ("Call_OI", "{:,.0f}"),
+    ("Call_IV", "{:.1%}"),
+    ("Call_Delta", "{:.2f}"),
+    ("Call_Yield", "{:.1%}"),
+    ("Strike", "{:.2f}"),
+    ("Put_Bid", "{:.2f}"),
+    ("Put_Ask", "{:.2f}"),
+    ("Put_OI", "{:,.0f}"),
+    ("Put_IV", "{:.1%}"),
+    ("Put_Delta", "{:.2f}"),
+    ("Put_Yield", "{:.1%}"),
+]
+
+
+# Columns written by --format csv/json
+EXPORT_COLUMNS = ["Expiry", "DTE", "Strike", "Moneyness"] + [
+    f"{side}_{name}"
+    for side in ("Call", "Put")
+    for name in (
+        "Bid",
+        "Ask",
+        "Last",
+        "Vol",
+        "OI",
+        "Mid",
+        "IV",
+        "Delta",
+        "Gamma",
+        "Theta",
+        "Vega",
+        "Yield",
+    )
+]
 
 
 def colorize(text, color):
     return f"[{color}]{text}[/{color}]"
 
 
-for expiry in options_by_expiry:
-    console.print(f"\n📅 [bold yellow]{expiry}[/bold yellow]")
-    table = Table(box=box.SIMPLE_HEAVY, expand=False)
-    for header in HEADERS:
-        table.add_column(header, justify="right", style="white", no_wrap=True)
-
-    for row in options_by_expiry[expiry]:
-        strike = float(row[7])
-        # put_bid, put_ask, put_mid = float(row[0]), float(row[1]), float(row[2])
-        # call_bid, call_ask, call_mid = float(row[8]), float(row[9]), float(row[10])
-
-        call_bid, call_ask, call_mid = float(row[0]), float(row[1]), float(row[2])
-        put_bid, put_ask, put_mid = float(row[8]), float(row[9]), float(row[10])
-
-        is_put_itm = strike < UNDERLYING_PRICE
-        is_call_itm = strike > UNDERLYING_PRICE
-
-        # Apply color to entire side if ITM
-        if is_put_itm:
-            row[0] = colorize(row[0], "cyan")
-            row[1] = colorize(row[1], "cyan")
-            row[2] = colorize(row[2], "cyan")
-            row[3] = colorize(row[3], "cyan")
-            row[4] = colorize(row[4], "cyan")
-            row[5] = colorize(row[5], "cyan")
-            row[6] = colorize(row[6], "cyan")
-        if is_call_itm:
-            row[8] = colorize(row[8], "cyan")
-            row[9] = colorize(row[9], "cyan")
-            row[10] = colorize(row[10], "cyan")
-            row[11] = colorize(row[11], "cyan")
-            row[12] = colorize(row[12], "cyan")
-            row[13] = colorize(row[13], "cyan")
-            row[14] = colorize(row[14], "cyan")
-            # row[15] = colorize(row[15], "cyan")
-
-        row[7] = colorize(row[7], "green")
-
-        table.add_row(*row)
-
-    console.print(table)
+def moneyness_window(priced: pd.DataFrame, low: float, high: float) -> pd.DataFrame:
+    """
+    Strikes with low <= strike / spot <= high.
+    """
+    return priced[priced["Moneyness"].between(low, high)]
+
+
+class ChainRenderer:
+    """
+    Prints a priced chain one expiry at a time, in pages of `page_size`
+    strikes, so output starts right away however many expiries there are.
+
+    Each expiry is formatted once into fixed-width markup lines (columns
+    right-aligned to their widest cell, ITM cells cyan) and cached; a page
+    is then a single print of cached lines rather than a rich Table, which
+    measures and renders every cell again on each print.
+    """
+
+    def __init__(
+        self,
+        priced: pd.DataFrame,
+        spot: float,
+        console: Console | None = None,
+        page_size: int = 50,
+    ):
+        self.spot = spot
+        self.console = console or Console()
+        self.page_size = page_size
+        self._groups = dict(list(priced.groupby("Expiry", sort=True)))
+        self._lines = {}
+
+    def lines(self, expiry) -> tuple[str, list[str]]:
+        """
+        (header, row lines) for `expiry`, formatted on first use.
+        """
+        if expiry not in self._lines:
+            self._lines[expiry] = self._format(self._groups[expiry])
+        return self._lines[expiry]
+
+    def _format(self, group: pd.DataFrame) -> tuple[str, list[str]]:
+        strike = group["Strike"].to_numpy()
+        itm = {"Call": strike < self.spot, "Put": strike > self.spot}
+
+        columns = []
+        for column, fmt in DISPLAY:
+            values = group[column].to_numpy()
+            cells = ["-" if np.isnan(v) else fmt.format(v) for v in values]
+            width = max(len(column), *map(len, cells)) if cells else len(column)
+            cells = [c.rjust(width) for c in cells]
+            if column == "Strike":
+                cells = [colorize(c, "green") for c in cells]
+            else:
+                side_itm = itm[column.split("_")[0]]
+                cells = [
+                    colorize(c, "cyan") if in_money else c
+                    for c, in_money in zip(cells, side_itm)
+                ]
+            columns.append((column.rjust(width), cells))
+
+        header = "  ".join(f"[bold]{name}[/bold]" for name, _ in columns)
+        rule = "━" * (sum(len(name) for name, _ in columns) + 2 * (len(columns) - 1))
+        rows = ["  ".join(cells) for cells in zip(*(c for _, c in columns))]
+        return f"{header}\n{rule}", rows
+
+    def render(self):
+        for expiry, group in self._groups.items():
+            header, rows = self.lines(expiry)
+            dte = int(group["DTE"].iloc[0])
+            self.console.print(
+                f"\n📅 [bold yellow]{expiry:%b. %d, %Y}[/bold yellow] "
+                f"({dte} DTE, spot {self.spot:.2f}, {len(rows)} strikes)"
+            )
+            for start in range(0, len(rows), self.page_size):
+                page = rows[start : start + self.page_size]
+                self.console.print(
+                    "\n".join([header, *page]), highlight=False, soft_wrap=True
+                )
+
+
+def render(priced: pd.DataFrame, spot: float, console: Console | None = None, **kwargs):
+    ChainRenderer(priced, spot, console, **kwargs).render()
+
+
+def write_csv(priced: pd.DataFrame, out):
+    """
+    Streams EXPORT_COLUMNS as CSV, one expiry at a time.
+    """
+    header = True
+    for _, group in priced.groupby("Expiry", sort=True):
+        group[EXPORT_COLUMNS].to_csv(
+            out,
+            index=False,
+            header=header,
+            date_format="%Y-%m-%d",
+            float_format="%.6g",
+        )
+        header = False
+
+
+def write_json(priced: pd.DataFrame, out):
+    """
+    Streams EXPORT_COLUMNS as JSON Lines (one contract row per line), one
+    expiry at a time; NaN becomes null.
+    """
+    for _, group in priced.groupby("Expiry", sort=True):
+        lines = group[EXPORT_COLUMNS].to_json(
+            orient="records", lines=True, date_format="iso", date_unit="s"
+        )
+        out.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price a pasted options chain.")
+    parser.add_argument("input_file")
+    parser.add_argument("--spot", type=float, help="underlying price")
+    parser.add_argument("--ticker", default="MSTR", help="spot source if no --spot")
+    parser.add_argument("--rate", type=float, default=RISK_FREE_RATE)
+    parser.add_argument("--div-yield", type=float, default=DIVIDEND_YIELD)
+    parser.add_argument(
+        "--moneyness",
+        nargs=2,
+        type=float,
+        metavar=("LOW", "HIGH"),
+        help="only strikes with LOW <= strike / spot <= HIGH, e.g. 0.8 1.2",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "csv", "json"],
+        default="table",
+        help="json is JSON Lines, one contract row per line",
+    )
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--pager", action="store_true", help="page table output")
+    args = parser.parse_args(argv)
+
+    spot = args.spot or spot_from_yfinance(args.ticker)
+    with open(args.input_file, "r") as f:
+        chain = load_chain(f)
+    priced = price_chain(chain, spot, rate=args.rate, div_yield=args.div_yield)
+    if args.moneyness:
+        priced = moneyness_window(priced, *args.moneyness)
+
+    if args.format in ("csv", "json"):
+        write = write_csv if args.format == "csv" else write_json
+        try:
+            write(priced, sys.stdout)
+        except BrokenPipeError:
+            # Piped into head and the like; stop quietly
+            sys.stderr.close()
+    else:
+        renderer = ChainRenderer(priced, spot, page_size=args.page_size)
+        if args.pager:
+            with renderer.console.pager(styles=True):
+                renderer.render()
+        else:
+            renderer.render()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -101,6 +101,17 @@ bull_std_dev_decay = 0.08
 bear_mean_decay = 0.04  # Bear: -4% average monthly NAV decay
 bear_std_dev_decay = 0.15
 
+# Optional pasted MSTR chain (see options_pricing.py). When set, the decay std
+# devs above are scaled each month by the surface's forward vol for that month
+# relative to the first month's, so they follow the market's term structure.
+vol_surface_chain = None
+vol_surface_spot = None  # MSTR price the chain was captured at
+
+# "gaussian": decay and yield are drawn from the regime parameters above.
+# "covered_call": both come from simulated MSTR paths and the premium of the
+# monthly call MSTY sells (utils/covered_call.py); uses the chain above for IV.
+distribution_model = "gaussian"
+
 
 # === Draw Tiers ===
 # Each tuple is (draw amount, min revenue, max revenue). Used to determine income draw based on revenue.
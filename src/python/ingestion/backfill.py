@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from . import dynamo
+from .distributions import (
+    BitWiseTickers,
+    YMTickers,
+    fetch_bitwise_distributions,
+    fetch_yield_max_distributions,
+)
+from . import price_cache
+from .prices import get_yahoo_history
+
+
+def ingest_ticker(ticker: str, start: str = None, end: str = None) -> int:
+    """
+    Fetch + scrape + write for one ticker, returns distribution record count.
+    """
+    prices = get_yahoo_history(ticker, start=start, end=end)
+    # Keep the local Parquet cache in step with the PRICE# rows just written
+    price_cache.update(ticker, prices)
+
+    df = pd.DataFrame()
+    if ticker in YMTickers:
+        df = fetch_yield_max_distributions(ticker)
+    elif ticker in BitWiseTickers:
+        df = fetch_bitwise_distributions(ticker, BitWiseTickers[ticker])
+
+    return len(df)
+
+
+def checkpoint_range(start: str = None, end: str = None) -> str:
+    return f"{start or 'default'}..{end or 'latest'}"
+
+
+def read_checkpoint(path: str) -> dict[str, list[str]]:
+    """
+    {date range: finished tickers}. Checkpoints from before ranges were
+    recorded don't say which range they covered, so they are ignored.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        completed = json.load(f).get("completed", {})
+    return completed if isinstance(completed, dict) else {}
+
+
+def load_checkpoint(path: str, start: str = None, end: str = None) -> set[str]:
+    return set(read_checkpoint(path).get(checkpoint_range(start, end), []))
+
+
+def write_checkpoint(path: str, ranges: dict[str, list[str]]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"completed": ranges}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(path: str, completed: set[str], start: str = None, end: str = None):
+    ranges = read_checkpoint(path)
+    ranges[checkpoint_range(start, end)] = sorted(completed)
+    write_checkpoint(path, ranges)
+
+
+def clear_checkpoint(path: str, start: str = None, end: str = None):
+    ranges = read_checkpoint(path)
+    ranges.pop(checkpoint_range(start, end), None)
+    if ranges:
+        write_checkpoint(path, ranges)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def backfill(
+    tickers: list[str],
+    start: str = None,
+    end: str = None,
+    workers: int = 4,
+    checkpoint: str = "backfill_checkpoint.json",
+):
+    """
+    Runs ingest_ticker for every ticker through a thread pool. Finished
+    tickers are recorded in `checkpoint` under the start/end range, so an
+    interrupted run can be resumed by re-running the same command; a
+    different range starts from scratch. The range is cleared once all
+    succeed.
+    """
+    completed = load_checkpoint(checkpoint, start, end)
+    pending = [t for t in tickers if t not in completed]
+    if completed:
+        print(f"⏩ Resuming from {checkpoint}, skipping {len(completed)} done")
+
+    lock = threading.Lock()
+    failed = {}
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(ingest_ticker, ticker, start, end): ticker for ticker in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            ticker = futures[future]
+            elapsed = time.perf_counter() - started
+            try:
+                count = future.result()
+            except Exception as e:
+                failed[ticker] = str(e)
+                print(f"[{done}/{len(pending)}] ❌ {ticker} failed: {e}")
+                continue
+
+            with lock:
+                completed.add(ticker)
+                save_checkpoint(checkpoint, completed, start, end)
+            print(
+                f"[{done}/{len(pending)}] ✅ {ticker}: {count} distributions "
+                f"({elapsed:.1f}s elapsed)"
+            )
+
+    if failed:
+        print(f"⚠️ {len(failed)} tickers failed, re-run to resume: {sorted(failed)}")
+    else:
+        clear_checkpoint(checkpoint, start, end)
+
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch and store Yahoo Finance history."
+    )
+    parser.add_argument(
+        "--ticker", type=str, default="MSTY", help="Ticker symbol, e.g. MSTY"
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Process --tickers concurrently instead of a single --ticker",
+    )
+    parser.add_argument(
+        "--tickers",
+        nargs="+",
+        default=YMTickers + list(BitWiseTickers),
+        help="Tickers to backfill (default: all YieldMax and Bitwise tickers)",
+    )
+    parser.add_argument("--start", type=str, default=None, help="e.g. 2024-01-01")
+    parser.add_argument("--end", type=str, default=None, help="e.g. 2025-06-30")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Tickers processed concurrently"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default="backfill_checkpoint.json",
+        help="Resume file for --backfill",
+    )
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=None,
+        help="Write with N parallel BatchWriteItem threads instead of batch_writer",
+    )
+    parser.add_argument(
+        "--max-wcu",
+        type=float,
+        default=None,
+        help="Cap combined write rate (WCU/sec); without --segments, one writer",
+    )
+    args = parser.parse_args()
+
+    if args.segments or args.max_wcu:
+        dynamo.init_bulk_writer(segments=args.segments or 1, max_wcu=args.max_wcu)
+
+    if args.backfill:
+        backfill(
+            args.tickers,
+            start=args.start,
+            end=args.end,
+            workers=args.workers,
+            checkpoint=args.checkpoint,
+        )
+    else:
+        print(f"Fetching price and dividend history for {args.ticker}...")
+        count = ingest_ticker(args.ticker, start=args.start, end=args.end)
+        print(f"Write {count} distribution records to DynamoDB.")
+
+    if dynamo.HistoricalDataBulkWriter is not None:
+        print(f"📊 Totals: {dynamo.HistoricalDataBulkWriter.totals.summary()}")
@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import ClientError
+
+BATCH_SIZE = 25  # DynamoDB hard limit per BatchWriteItem request
+THROTTLE_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all writer threads, refilled at `rate` units/sec.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        # Burst must fit a full batch or a low rate would never admit one
+        self.capacity = max(rate, BATCH_SIZE)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, units: float):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= units:
+                    self.tokens -= units
+                    return
+                wait = (units - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class BulkWriteStats:
+    def __init__(self):
+        self.items = 0
+        self.requests = 0
+        self.consumed_wcu = 0.0
+        self.throttles = 0
+        self.unprocessed_retries = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    def merge(self, other: "BulkWriteStats"):
+        self.items += other.items
+        self.requests += other.requests
+        self.consumed_wcu += other.consumed_wcu
+        self.throttles += other.throttles
+        self.unprocessed_retries += other.unprocessed_retries
+        self.failed += other.failed
+
+    def summary(self) -> str:
+        seconds = self.seconds or float("inf")
+        return (
+            f"{self.items} items in {self.seconds:.2f}s "
+            f"({self.items / seconds:,.0f} items/s), "
+            f"{self.consumed_wcu:,.1f} WCU ({self.consumed_wcu / seconds:,.1f} WCU/s), "
+            f"{self.requests} requests, {self.throttles} throttles, "
+            f"{self.unprocessed_retries} unprocessed retries, {self.failed} failed"
+        )
+
+
+class BulkWriter:
+    """
+    Writes items with BatchWriteItem from `segments` concurrent threads.
+
+    Items are de-duplicated on the table key (last write wins, like
+    batch_writer's overwrite_by_pkeys), chunked into 25-item requests and
+    dealt round-robin to the writer threads. UnprocessedItems and throttling
+    errors are retried with jittered exponential backoff. `max_wcu_per_sec`
+    caps the combined write rate, assuming 1 WCU per item up front (items
+    here are well under 1 KB) and reporting what DynamoDB actually consumed.
+    """
+
+    def __init__(
+        self,
+        table,
+        segments: int = 4,
+        max_wcu_per_sec: float = None,
+        max_retries: int = 8,
+        key_names=("PK", "SK"),
+    ):
+        self.table = table
+        self.client = table.meta.client
+        self.segments = max(1, segments)
+        self.limiter = RateLimiter(max_wcu_per_sec) if max_wcu_per_sec else None
+        self.max_retries = max_retries
+        self.key_names = key_names
+        self.totals = BulkWriteStats()
+        self._totals_lock = threading.Lock()
+        self._first_write = None
+
+    def write(self, items: list[dict]) -> BulkWriteStats:
+        unique = {tuple(item[k] for k in self.key_names): item for item in items}
+        # table.meta.client carries boto3's type transformer, so plain
+        # Python/Decimal items can go straight into the request
+        requests = [{"PutRequest": {"Item": item}} for item in unique.values()]
+        batches = [
+            requests[i : i + BATCH_SIZE] for i in range(0, len(requests), BATCH_SIZE)
+        ]
+        segments = [batches[i :: self.segments] for i in range(self.segments)]
+
+        stats = BulkWriteStats()
+        start = time.perf_counter()
+        with self._totals_lock:
+            self._first_write = self._first_write or start
+        with ThreadPoolExecutor(max_workers=self.segments) as pool:
+            for segment_stats in pool.map(self._write_segment, segments):
+                stats.merge(segment_stats)
+        stats.seconds = time.perf_counter() - start
+
+        # write() may be called from several ticker workers at once, so totals
+        # use wall time since the first write rather than summed durations
+        with self._totals_lock:
+            self.totals.merge(stats)
+            self.totals.seconds = time.perf_counter() - self._first_write
+        return stats
+
+    def _write_segment(self, batches: list[list[dict]]) -> BulkWriteStats:
+        stats = BulkWriteStats()
+        for batch in batches:
+            self._write_batch(batch, stats)
+        return stats
+
+    def _write_batch(self, batch: list[dict], stats: BulkWriteStats):
+        pending, attempt = batch, 0
+        while pending:
+            if self.limiter:
+                self.limiter.acquire(len(pending))
+
+            try:
+                response = self.client.batch_write_item(
+                    RequestItems={self.table.name: pending},
+                    ReturnConsumedCapacity="TOTAL",
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in THROTTLE_ERRORS:
+                    raise
+                stats.throttles += 1
+                unprocessed = pending
+            else:
+                stats.requests += 1
+                for consumed in response.get("ConsumedCapacity", []):
+                    stats.consumed_wcu += consumed.get("CapacityUnits", 0)
+                unprocessed = response.get("UnprocessedItems", {}).get(
+                    self.table.name, []
+                )
+                stats.items += len(pending) - len(unprocessed)
+                stats.unprocessed_retries += len(unprocessed)
+
+            if not unprocessed:
+                return
+
+            attempt += 1
+            if attempt > self.max_retries:
+                stats.failed += len(unprocessed)
+                print(f"⚠️ Giving up on {len(unprocessed)} items after {attempt} tries")
+                return
+
+            time.sleep(min(20, 0.05 * 2**attempt) * random.uniform(0.5, 1.0))
+            pending = unprocessed
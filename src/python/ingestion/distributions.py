@@ -0,0 +1,175 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from . import dynamo
+
+YMTickers = ["YMAX", "MSTY", "AMZY", "NVDY", "CONY"]
+
+BitWiseTickers = {
+    "IMST": "https://imstetf.com/",
+    "IMRA": "https://imraetf.com/",
+}
+
+YM_DISTRIBUTION_HEADERS = {
+    "distribution per share",
+    "declared date",
+    "ex date",
+    "record date",
+    "payable date",
+}
+
+
+def parse_yield_max_distributions(html: bytes, ticker: str) -> list[dict]:
+    """
+    Parses the YieldMax distribution table out of a fund page.
+    """
+    # Scraper-only dependencies are imported on use to keep cold starts lean
+    import lxml.html
+
+    doc = lxml.html.fromstring(html)
+
+    # Find table by matching column headers, only tables with <th> cells qualify
+    target_table = None
+    for table in doc.xpath("//table[.//th]"):
+        headers = {th.text_content().strip().lower() for th in table.xpath(".//th")}
+        if YM_DISTRIBUTION_HEADERS <= headers:
+            target_table = table
+            break
+
+    if target_table is None:
+        raise ValueError("Could not find distribution table on page.")
+
+    records = []
+    for row in target_table.xpath("./tbody/tr"):
+        cols = [td.text_content().strip() for td in row.xpath("./td")]
+        if len(cols) < 6:
+            continue
+
+        _, amount, declared, ex, record, payable = cols
+        try:
+            records.append(
+                {
+                    "ticker": ticker,
+                    "amount": float(amount),
+                    "declared_date": pd.to_datetime(declared).strftime("%Y-%m-%d"),
+                    "ex_date": pd.to_datetime(ex).strftime("%Y-%m-%d"),
+                    "record_date": pd.to_datetime(record).strftime("%Y-%m-%d"),
+                    "payable_date": pd.to_datetime(payable).strftime("%Y-%m-%d"),
+                }
+            )
+        except Exception as e:
+            print(f"⚠️ Skipping row: {cols} ({e})")
+
+    return records
+
+
+def fetch_yield_max_distributions(ticker: str) -> pd.DataFrame:
+    """
+    Scrapes YieldMax distribution table from the given URL and returns a DataFrame.
+    """
+    import requests
+
+    source = f"https://www.yieldmaxetfs.com/our-etfs/{ticker}/"
+    response = requests.get(source)
+    records = parse_yield_max_distributions(response.content, ticker)
+
+    df = pd.DataFrame(records)
+
+    items = []
+    for _, row in df.iterrows():
+        if pd.isna(row["amount"]) or row["amount"] <= 0:
+            print(f"⚠️ Skipping row with invalid amount: {row['amount']}")
+            continue
+
+        item = {
+            "PK": ticker,
+            "SK": f"DIST#{row['declared_date']}",
+            "amount": Decimal(str(row["amount"])),
+            "declared_date": row["declared_date"],
+            "ex_date": row["ex_date"],
+            "record_date": row["record_date"],
+            "payable_date": row["payable_date"],
+        }
+
+        # Remove any None values for a clean DynamoDB write
+        item = {k: v for k, v in item.items() if v is not None}
+
+        items.append(item)
+
+    dynamo.put_items(items)
+
+    return pd.DataFrame(records)
+
+
+def parse_bitwise_distributions(html: bytes, ticker: str) -> list[dict]:
+    """
+    Parses the Bitwise distribution rows out of a fund page.
+    """
+    import lxml.html
+
+    doc = lxml.html.fromstring(html)
+
+    # Narrow to only the main distributions section
+    roots = doc.xpath("//div[@id='distributions']")
+    if not roots:
+        print("❌ Could not find #distributions section.")
+        return []
+
+    # Data rows are the divs with exactly 5 inner divs
+    records = []
+    for row in roots[0].xpath(".//div[count(div)=5]"):
+        children = [c.text_content().strip() for c in row.xpath("./div")]
+
+        try:
+            declared, ex, record, payable, amount = children
+            if "$" not in amount:
+                continue
+
+            records.append(
+                {
+                    "ticker": ticker,
+                    "amount": float(amount.replace("$", "").replace(",", "")),
+                    "declared_date": pd.to_datetime(declared).strftime("%Y-%m-%d"),
+                    "ex_date": pd.to_datetime(ex).strftime("%Y-%m-%d"),
+                    "record_date": pd.to_datetime(record).strftime("%Y-%m-%d"),
+                    "payable_date": pd.to_datetime(payable).strftime("%Y-%m-%d"),
+                }
+            )
+        except Exception as e:
+            print(f"⚠️ Skipping malformed row: {children} ({e})")
+
+    return records
+
+
+def fetch_bitwise_distributions(ticker: str, url: str) -> pd.DataFrame:
+    import requests
+
+    response = requests.get(url)
+    records = parse_bitwise_distributions(response.content, ticker)
+    if not records:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(records)
+
+    items = []
+    for _, row in df.iterrows():
+        if pd.isna(row["amount"]) or row["amount"] <= 0:
+            continue
+
+        item = {
+            "PK": ticker,
+            "SK": f"DIST#{row['declared_date']}",
+            "amount": Decimal(str(row["amount"])),
+            "declared_date": row["declared_date"],
+            "ex_date": row["ex_date"],
+            "record_date": row["record_date"],
+            "payable_date": row["payable_date"],
+        }
+
+        items.append({k: v for k, v in item.items() if v is not None})
+
+    dynamo.put_items(items)
+
+    print(f"Wrote {len(df)} Bitwise distribution records for {ticker}.")
+    return df
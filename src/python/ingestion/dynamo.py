@@ -0,0 +1,48 @@
+import os
+
+import boto3
+
+from .bulk_writer import BulkWriter
+
+ENV_NAME = os.getenv("ENV_NAME", "dev")
+
+HistoricalDataTableName = f"{ENV_NAME}-HistoricalData"
+HistoricalDataTable = None
+
+
+def init_env():
+    global ENV_NAME, AWS_REGION, HistoricalDataTable, HistoricalDataTableName
+
+    ENV_NAME = os.getenv("ENV_NAME", "dev")
+    AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+    HistoricalDataTableName = f"{ENV_NAME}-HistoricalData"
+
+    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    HistoricalDataTable = dynamodb.Table(HistoricalDataTableName)
+
+    print(f"✅ Using DynamoDB table: {HistoricalDataTableName} in {AWS_REGION}")
+
+
+HistoricalDataBulkWriter = None
+
+
+def init_bulk_writer(segments: int = 4, max_wcu: float = None):
+    """
+    Route all writes through a parallel BulkWriter instead of batch_writer.
+    """
+    global HistoricalDataBulkWriter
+
+    HistoricalDataBulkWriter = BulkWriter(
+        HistoricalDataTable, segments=segments, max_wcu_per_sec=max_wcu
+    )
+
+
+def put_items(items: list[dict]):
+    if HistoricalDataBulkWriter is not None:
+        stats = HistoricalDataBulkWriter.write(items)
+        print(f"📦 {stats.summary()}")
+        return
+
+    with HistoricalDataTable.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+        for item in items:
+            batch.put_item(Item=item)
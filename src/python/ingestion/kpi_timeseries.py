@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Key
+
+# StrategyKPIs time-series layout (all in the one PK/SK table):
+#
+#   points   PK = MSTR#2025-09-30          SK = <timeStampUtc>
+#   hourly   PK = MSTR#HOURLY#2025-09      SK = 2025-09-30T14
+#   daily    PK = MSTR#DAILY#2025          SK = 2025-09-30
+#
+# A month of hourly rollups is ~720 small items in one partition, so a
+# dashboard or simulator gets a month of MSTR implied vol from one Query.
+
+ROLLUP_METRICS = ["price", "implied_vol", "put_call_ratio", "total_oi"]
+
+# granularity -> (partition suffix format, sort key format, step between sort keys)
+GRANULARITIES = {
+    "HOURLY": ("%Y-%m", "%Y-%m-%dT%H", timedelta(hours=1)),
+    "DAILY": ("%Y", "%Y-%m-%d", timedelta(days=1)),
+}
+
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def point_pk(ticker: str, timestamp: str) -> str:
+    return f"{ticker}#{parse_timestamp(timestamp):%Y-%m-%d}"
+
+
+def rollup_key(ticker: str, granularity: str, when: datetime) -> dict:
+    partition_fmt, sort_fmt, _ = GRANULARITIES[granularity]
+    return {
+        "PK": f"{ticker}#{granularity}#{when.strftime(partition_fmt)}",
+        "SK": when.strftime(sort_fmt),
+    }
+
+
+def merge_rollup(rollup: dict, key: dict, timestamp: str, values: dict) -> dict:
+    """
+    Folds one point into an hourly/daily rollup row (open/high/low/close,
+    sum and count per metric). Points at or before the rollup's last_ts are
+    ignored so re-running an invocation doesn't double count.
+    """
+    if rollup and timestamp <= rollup["last_ts"]:
+        return None
+
+    item = dict(rollup) if rollup else {**key, "first_ts": timestamp}
+    item["last_ts"] = timestamp
+
+    for metric in ROLLUP_METRICS:
+        if values.get(metric) is None:
+            continue
+
+        value = Decimal(str(values[metric]))
+        if f"{metric}_count" not in item:
+            item[f"{metric}_open"] = value
+            item[f"{metric}_high"] = value
+            item[f"{metric}_low"] = value
+            item[f"{metric}_sum"] = value
+            item[f"{metric}_count"] = 1
+        else:
+            item[f"{metric}_high"] = max(item[f"{metric}_high"], value)
+            item[f"{metric}_low"] = min(item[f"{metric}_low"], value)
+            item[f"{metric}_sum"] += value
+            item[f"{metric}_count"] += 1
+        item[f"{metric}_close"] = value
+
+    return item
+
+
+def build_rollup_items(table, points: dict) -> list[dict]:
+    """
+    Returns the updated hourly and daily rollup rows for `points`
+    ({ticker: kpi dict with "timestamp"}), reading the current rows with a
+    single BatchGetItem. The Lambda is the only writer, on a fixed schedule,
+    so read-merge-write is safe here without conditional updates.
+    """
+    keys = {}
+    for ticker, data in points.items():
+        when = parse_timestamp(data["timestamp"])
+        for granularity in GRANULARITIES:
+            key = rollup_key(ticker, granularity, when)
+            keys[(key["PK"], key["SK"])] = (key, ticker)
+
+    existing = {}
+    request = {table.name: {"Keys": [key for key, _ in keys.values()]}}
+    while request:
+        response = table.meta.client.batch_get_item(RequestItems=request)
+        for item in response["Responses"].get(table.name, []):
+            existing[(item["PK"], item["SK"])] = item
+        request = response.get("UnprocessedKeys")
+
+    rollups = []
+    for pk_sk, (key, ticker) in keys.items():
+        data = points[ticker]
+        merged = merge_rollup(existing.get(pk_sk), key, data["timestamp"], data)
+        if merged:
+            rollups.append(merged)
+
+    return rollups
+
+
+def query_rollups(
+    table,
+    ticker: str,
+    start: datetime,
+    end: datetime,
+    granularity: str = "HOURLY",
+    metrics: list[str] = None,
+) -> list[dict]:
+    """
+    Rollup rows for [start, end], one Query per partition touched (a single
+    one for a calendar month of hourly data). `metrics` limits the projection,
+    e.g. ["implied_vol"] returns only the implied_vol_* stats.
+    """
+    partition_fmt, sort_fmt, step = GRANULARITIES[granularity]
+
+    partitions = []
+    when = start
+    while when <= end:
+        partition = f"{ticker}#{granularity}#{when.strftime(partition_fmt)}"
+        if partition not in partitions:
+            partitions.append(partition)
+        when += step
+    end_partition = f"{ticker}#{granularity}#{end.strftime(partition_fmt)}"
+    if end_partition not in partitions:
+        partitions.append(end_partition)
+
+    kwargs = {}
+    if metrics:
+        stats = ["open", "high", "low", "close", "sum", "count"]
+        names = ["SK", "first_ts", "last_ts"] + [
+            f"{m}_{s}" for m in metrics for s in stats
+        ]
+        kwargs["ProjectionExpression"] = ", ".join(f"#a{i}" for i in range(len(names)))
+        kwargs["ExpressionAttributeNames"] = {f"#a{i}": n for i, n in enumerate(names)}
+
+    items = []
+    for partition in partitions:
+        key_expr = Key("PK").eq(partition) & Key("SK").between(
+            start.strftime(sort_fmt), end.strftime(sort_fmt)
+        )
+        response = table.query(KeyConditionExpression=key_expr, **kwargs)
+        items.extend(response.get("Items", []))
+        while "LastEvaluatedKey" in response:
+            response = table.query(
+                KeyConditionExpression=key_expr,
+                ExclusiveStartKey=response["LastEvaluatedKey"],
+                **kwargs,
+            )
+            items.extend(response.get("Items", []))
+
+    return items
+
+
+def query_points(table, ticker: str, day: str) -> list[dict]:
+    """
+    All raw KPI points for one ticker-day bucket, e.g. ("MSTR", "2025-09-30").
+    """
+    response = table.query(KeyConditionExpression=Key("PK").eq(f"{ticker}#{day}"))
+    items = response.get("Items", [])
+    while "LastEvaluatedKey" in response:
+        response = table.query(
+            KeyConditionExpression=Key("PK").eq(f"{ticker}#{day}"),
+            ExclusiveStartKey=response["LastEvaluatedKey"],
+        )
+        items.extend(response.get("Items", []))
+    return items
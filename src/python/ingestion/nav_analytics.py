@@ -0,0 +1,262 @@
+"""
+Ex-dividend-adjusted NAV analytics for the income ETFs.
+
+The DIST#<declared date> rows in HistoricalData are joined to daily prices on
+their ex-date (the next trading day when the ex-date is not one), giving per
+ticker:
+
+  - price_index: close / first close, what the NAV chart shows;
+  - total_index: distributions reinvested on the ex-date,
+    prod((close_t + dist_t) / close_{t-1});
+  - rolling trends: OLS of log index on trading day over `window` days, in
+    closed form from cumulative sums (no refit per window), annualized.
+
+Price return minus total return is the NAV decay the distributions cost.
+analyze_all() loads every YieldMax/Bitwise ticker concurrently and returns one
+summary row per ticker.
+
+Distributions are cached next to the prices (<TICKER>.dist.parquet), so with
+offline=True nothing touches DynamoDB.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import BotoCoreError, ClientError
+
+from . import dynamo, price_cache
+from .distributions import BitWiseTickers, YMTickers
+
+TRADING_DAYS = 252
+DEFAULT_WINDOW = 63  # about three months of trading days
+
+
+DIST_COLUMNS = ["ex_date", "amount"]
+
+
+def dist_cache_path(ticker: str) -> str:
+    return os.path.join(price_cache.cache_dir(), f"{ticker.upper()}.dist.parquet")
+
+
+def query_distributions(ticker: str) -> pd.DataFrame:
+    """
+    (ex_date, amount) for every DIST# row of `ticker`.
+    """
+    if dynamo.HistoricalDataTable is None:
+        dynamo.init_env()
+
+    kwargs = {
+        "KeyConditionExpression": Key("PK").eq(ticker) & Key("SK").begins_with("DIST#"),
+        "ProjectionExpression": "ex_date, amount",
+    }
+    rows = []
+    while True:
+        response = dynamo.HistoricalDataTable.query(**kwargs)
+        rows.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    df = pd.DataFrame(rows, columns=DIST_COLUMNS)
+    df["ex_date"] = pd.to_datetime(df["ex_date"])
+    df["amount"] = pd.to_numeric(df["amount"]).astype("float64")
+    return df.dropna().reset_index(drop=True)
+
+
+def load_distributions(ticker: str, offline: bool = False) -> pd.DataFrame:
+    """
+    DIST# rows from DynamoDB, refreshing the local cache, or the cached copy
+    when offline or DynamoDB is unreachable. With neither, an empty frame:
+    total return then equals price return.
+    """
+    path = dist_cache_path(ticker)
+    if not offline:
+        try:
+            df = query_distributions(ticker)
+            price_cache.write_parquet(path, df)
+            return df
+        except (BotoCoreError, ClientError) as e:
+            print(f"⚠️ DynamoDB distributions unavailable for {ticker}: {e}")
+
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    print(f"⚠️ No cached distributions for {ticker}; using price return only")
+    return pd.DataFrame(
+        {
+            "ex_date": pd.Series(dtype="datetime64[ns]"),
+            "amount": pd.Series(dtype="float64"),
+        }
+    )
+
+
+def join_distributions(prices: pd.DataFrame, dists: pd.DataFrame) -> pd.DataFrame:
+    """
+    `prices` (date, close) sorted by date, plus a dist column: the amount
+    going ex on each day, summed when several share a day.
+    """
+    df = prices[["date", "close"]].sort_values("date").reset_index(drop=True)
+    dates = df["date"].to_numpy(dtype="datetime64[ns]")
+    dist = np.zeros(len(df))
+
+    if len(dists) and len(df):
+        ex = dists["ex_date"].to_numpy(dtype="datetime64[ns]")
+        at = np.searchsorted(dates, ex, side="left")
+        inside = (ex >= dates[0]) & (at < len(df))
+        np.add.at(dist, at[inside], dists["amount"].to_numpy()[inside])
+
+    df["dist"] = dist
+    return df
+
+
+def add_return_indices(df: pd.DataFrame) -> pd.DataFrame:
+    close = df["close"].to_numpy(dtype="float64")
+    growth = np.ones(len(close))
+    growth[1:] = (close[1:] + df["dist"].to_numpy()[1:]) / close[:-1]
+
+    df = df.copy()
+    df["price_index"] = close / close[0]
+    df["total_index"] = np.cumprod(growth)
+    df["cum_dist"] = df["dist"].cumsum()
+    return df
+
+
+def rolling_regression(y: np.ndarray, window: int) -> dict:
+    """
+    OLS of y on 0..n-1 over each trailing `window` of points, from cumulative
+    sums: O(n) whatever the window. Arrays are NaN until a window is full.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    out = {k: np.full(n, np.nan) for k in ("slope", "intercept", "r2")}
+    if window < 2 or n < window:
+        return out
+
+    # x counted from the window start keeps the sums small: within every
+    # window x runs 0..window-1, so Sx and Sxx are constants
+    x = np.arange(window, dtype="float64")
+    sx, sxx = x.sum(), (x * x).sum()
+
+    def window_sums(values):
+        c = np.concatenate([[0.0], np.cumsum(values)])
+        return c[window:] - c[:-window]
+
+    idx = np.arange(n, dtype="float64")
+    sy = window_sums(y)
+    syy = window_sums(y * y)
+    # sum((i - start) * y_i) = sum(i * y_i) - start * sum(y_i)
+    start = np.arange(n - window + 1, dtype="float64")
+    sxy = window_sums(idx * y) - start * sy
+
+    var_x = window * sxx - sx * sx
+    cov = window * sxy - sx * sy
+    var_y = window * syy - sy * sy
+    slope = cov / var_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(var_y > 0, cov * cov / (var_x * var_y), 1.0)
+
+    out["slope"][window - 1 :] = slope
+    # Intercept at the window's last point, i.e. the fitted current value
+    out["intercept"][window - 1 :] = (sy - slope * sx) / window + slope * (window - 1)
+    out["r2"][window - 1 :] = r2
+    return out
+
+
+def annualize(daily_log_slope):
+    return np.expm1(np.asarray(daily_log_slope) * TRADING_DAYS)
+
+
+def analyze(
+    prices: pd.DataFrame, dists: pd.DataFrame, window: int = DEFAULT_WINDOW
+) -> pd.DataFrame:
+    """
+    Daily frame: date, close, dist, price_index, total_index, cum_dist and,
+    for the trailing `window`, annualized price_trend / total_trend, their
+    gap (decay) and the price fit's r2.
+    """
+    df = add_return_indices(join_distributions(prices, dists))
+    price_fit = rolling_regression(np.log(df["price_index"].to_numpy()), window)
+    total_fit = rolling_regression(np.log(df["total_index"].to_numpy()), window)
+    df["price_trend"] = annualize(price_fit["slope"])
+    df["total_trend"] = annualize(total_fit["slope"])
+    df["decay"] = df["total_trend"] - df["price_trend"]
+    df["r2"] = price_fit["r2"]
+    return df
+
+
+def summarize(ticker: str, df: pd.DataFrame) -> dict:
+    years = (df["date"].iloc[-1] - df["date"].iloc[0]).days / 365.25
+    price_return = df["price_index"].iloc[-1] - 1
+    total_return = df["total_index"].iloc[-1] - 1
+    last_year = df["date"] > df["date"].iloc[-1] - pd.DateOffset(years=1)
+    full_fit = rolling_regression(np.log(df["price_index"].to_numpy()), len(df))
+
+    def cagr(total):
+        return (1 + total) ** (1 / years) - 1 if years > 0 else np.nan
+
+    return {
+        "ticker": ticker,
+        "start": df["date"].iloc[0].date(),
+        "end": df["date"].iloc[-1].date(),
+        "close": df["close"].iloc[-1],
+        "distributions": int((df["dist"] > 0).sum()),
+        "price_return": price_return,
+        "total_return": total_return,
+        "price_cagr": cagr(price_return),
+        "total_cagr": cagr(total_return),
+        "ttm_yield": df.loc[last_year, "dist"].sum() / df["close"].iloc[-1],
+        "price_trend": annualize(full_fit["slope"][-1]),
+        "trend_r2": full_fit["r2"][-1],
+        "recent_price_trend": df["price_trend"].iloc[-1],
+        "recent_total_trend": df["total_trend"].iloc[-1],
+    }
+
+
+def analyze_ticker(
+    ticker: str, window: int = DEFAULT_WINDOW, fetch=None, offline: bool = False
+) -> tuple[pd.DataFrame, dict]:
+    prices = price_cache.load_prices(ticker, fetch=fetch, offline=offline)
+    if len(prices) < 2:
+        raise ValueError(f"not enough prices for {ticker}")
+    dists = load_distributions(ticker, offline)
+    df = analyze(prices, dists, window)
+    return df, summarize(ticker, df)
+
+
+def analyze_all(
+    tickers: list[str] | None = None,
+    window: int = DEFAULT_WINDOW,
+    workers: int = 8,
+    fetch=None,
+    offline: bool = False,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Runs analyze_ticker for every ticker (all YieldMax and Bitwise tickers by
+    default) through a thread pool. Returns the summary table, sorted by
+    total CAGR, and {ticker: daily frame}; failures are reported and skipped.
+    """
+    tickers = tickers or YMTickers + list(BitWiseTickers)
+    if not offline and dynamo.HistoricalDataTable is None:
+        dynamo.init_env()
+
+    def run(ticker):
+        try:
+            return ticker, analyze_ticker(ticker, window, fetch, offline)
+        except (BotoCoreError, ClientError, RuntimeError, ValueError) as e:
+            print(f"⚠️ {ticker} skipped: {e}")
+            return ticker, None
+
+    frames, rows = {}, []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for ticker, result in pool.map(run, tickers):
+            if result is None:
+                continue
+            frames[ticker], summary = result
+            rows.append(summary)
+
+    summary = pd.DataFrame(rows)
+    if not summary.empty:
+        summary = summary.sort_values("total_cagr", ascending=False)
+    return summary.reset_index(drop=True), frames
@@ -0,0 +1,161 @@
+"""
+Local Parquet cache of daily prices, one file per ticker.
+
+load_prices() reads the cached history and only fetches what comes after
+its last date: first from the PRICE#<date> rows in HistoricalData (what
+prices.get_yahoo_history and the backfill wrote), then from `fetch` (e.g.
+the Nasdaq API) for anything DynamoDB does not have yet. The last cached
+day is always re-fetched, in case it was cached before that day's close.
+When neither source is reachable the cache is returned as is, so analysis
+works offline. The backfill CLI also merges what it ingests into the cache.
+
+PRICE_CACHE_DIR overrides the location (~/.cache/baselayercapital/prices).
+"""
+
+import os
+from datetime import date
+
+import pandas as pd
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import BotoCoreError, ClientError
+
+from . import dynamo
+
+CACHE_COLUMNS = ["date", "open", "high", "low", "close", "adjclose", "volume"]
+DEFAULT_START = "2015-06-19"
+
+
+def cache_dir() -> str:
+    return os.getenv(
+        "PRICE_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "baselayercapital", "prices"),
+    )
+
+
+def cache_path(ticker: str) -> str:
+    return os.path.join(cache_dir(), f"{ticker.upper()}.parquet")
+
+
+def read_cache(ticker: str) -> pd.DataFrame | None:
+    path = cache_path(ticker)
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+
+def write_parquet(path: str, df: pd.DataFrame):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def write_cache(ticker: str, df: pd.DataFrame):
+    write_parquet(cache_path(ticker), df)
+
+
+def merge(cached: pd.DataFrame | None, new: pd.DataFrame | None) -> pd.DataFrame:
+    """
+    Union by date, newer rows winning, restricted to CACHE_COLUMNS.
+    """
+    frames = [
+        df[[c for c in CACHE_COLUMNS if c in df.columns]]
+        for df in (cached, new)
+        if df is not None and not df.empty
+    ]
+    if not frames:
+        return pd.DataFrame(columns=CACHE_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"]).dt.tz_localize(None).dt.normalize()
+    df = df.dropna(subset=["close"])
+    return (
+        df.drop_duplicates("date", keep="last")
+        .sort_values("date")
+        .reset_index(drop=True)
+    )
+
+
+def update(ticker: str, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merges freshly fetched rows into the cache and returns the full history.
+    """
+    df = merge(read_cache(ticker), new)
+    write_cache(ticker, df)
+    return df
+
+
+def dynamo_prices(ticker: str, start: str, end: str) -> pd.DataFrame:
+    """
+    PRICE#<date> rows for start <= date <= end from HistoricalData.
+    """
+    if dynamo.HistoricalDataTable is None:
+        dynamo.init_env()
+
+    kwargs = {
+        "KeyConditionExpression": Key("PK").eq(ticker)
+        & Key("SK").between(f"PRICE#{start}", f"PRICE#{end}"),
+        "ProjectionExpression": "SK, #o, high, low, #c, adjclose, volume",
+        "ExpressionAttributeNames": {"#o": "open", "#c": "close"},
+    }
+    rows = []
+    while True:
+        response = dynamo.HistoricalDataTable.query(**kwargs)
+        rows.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    if not rows:
+        return pd.DataFrame(columns=CACHE_COLUMNS)
+    df = pd.DataFrame(rows)
+    df["date"] = pd.to_datetime(df.pop("SK").str.removeprefix("PRICE#"))
+    for column in CACHE_COLUMNS[1:]:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+def load_prices(
+    ticker: str,
+    fetch=None,
+    use_dynamo: bool = True,
+    offline: bool = False,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """
+    Full daily history for `ticker` (date, close, plus whatever OHLC columns
+    the sources had), fetching only past the cache. `fetch(ticker, start)`
+    returns a frame with at least date and close; `refresh` ignores the cache.
+    """
+    cached = None if refresh else read_cache(ticker)
+    if offline:
+        if cached is None:
+            raise RuntimeError(f"No cached prices for {ticker} in {cache_dir()}")
+        return cached
+
+    today = date.today().isoformat()
+    start = (
+        cached["date"].max().strftime("%Y-%m-%d")
+        if cached is not None and not cached.empty
+        else DEFAULT_START
+    )
+    df = cached
+
+    if use_dynamo:
+        try:
+            df = merge(df, dynamo_prices(ticker, start, today))
+        except (BotoCoreError, ClientError) as e:
+            print(f"⚠️ DynamoDB prices unavailable for {ticker}: {e}")
+
+    if fetch is not None:
+        have_rows = df is not None and not df.empty
+        after = df["date"].max().strftime("%Y-%m-%d") if have_rows else start
+        try:
+            df = merge(df, fetch(ticker, after))
+        except Exception as e:
+            if df is None or df.empty:
+                raise
+            print(f"⚠️ Fetch failed for {ticker}, using cached prices: {e}")
+
+    df = merge(df, None)
+    if cached is None or not df.equals(cached):
+        write_cache(ticker, df)
+    return df
@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from . import dynamo
+
+
+def get_yahoo_history(ticker: str, start: str = None, end: str = None) -> pd.DataFrame:
+    # yfinance drags in ~150ms of imports, only pay for it when fetching
+    import yfinance as yf
+
+    ticker_obj = yf.Ticker(ticker)
+    if start or end:
+        df = ticker_obj.history(start=start, end=end, auto_adjust=False)
+    else:
+        df = ticker_obj.history(period="max", auto_adjust=False)
+
+    df = df.reset_index()
+    df.columns = [col.lower().replace(" ", "") for col in df.columns]
+    df["date"] = pd.to_datetime(df["date"]).dt.tz_localize(None)
+    write_to_dynamo(df, ticker=ticker, sk_prefix="PRICE#")
+    return df
+
+
+def safe_decimal(value):
+    """
+    Convert a value to Decimal, handling NaN values.
+    """
+    return Decimal(str(value)) if not pd.isna(value) else None
+
+
+def write_to_dynamo(df: pd.DataFrame, ticker: str, sk_prefix: str = "PRICE#"):
+    items = []
+    for _, row in df.iterrows():
+        if pd.isna(row["close"]):
+            continue
+
+        date_str = row["date"].strftime("%Y-%m-%d")
+        item = {
+            "PK": ticker,
+            "SK": f"{sk_prefix}{date_str}",
+            "open": safe_decimal(row.get("open")),
+            "high": safe_decimal(row.get("high")),
+            "low": safe_decimal(row.get("low")),
+            "close": safe_decimal(row.get("close")),
+            "adjclose": safe_decimal(row.get("adjclose")),
+            "volume": int(row["volume"]) if not pd.isna(row.get("volume")) else None,
+            "dividend": safe_decimal(row.get("dividends")),
+            "stocksplits": safe_decimal(row.get("stocksplits")),
+            "capitalgains": safe_decimal(row.get("capitalgains")),
+        }
+
+        # Remove any None values for a clean DynamoDB write
+        item = {k: v for k, v in item.items() if v is not None}
+
+        items.append(item)
+
+    dynamo.put_items(items)
+
+    print(f"Wrote {len(df)} items to {dynamo.HistoricalDataTableName} for {ticker}.")
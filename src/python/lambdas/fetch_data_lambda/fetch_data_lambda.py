@@ -1,9 +1,9 @@
-from fetch_symbol_div_info import (
-    get_yahoo_history,
-    fetch_yield_max_distributions,
+from ingestion.distributions import (
     fetch_bitwise_distributions,
-    init_env,
+    fetch_yield_max_distributions,
 )
+from ingestion.dynamo import init_env
+from ingestion.prices import get_yahoo_history
 
 YMTickers = ["MSTY"]
 BitWiseTickers = {
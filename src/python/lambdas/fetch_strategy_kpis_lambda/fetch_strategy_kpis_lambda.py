@@ -1,7 +1,18 @@
+import gzip
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, UTC
+from decimal import Decimal
+
 import boto3
+from boto3.dynamodb.types import Binary
 import requests
-from datetime import datetime, UTC
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ingestion.kpi_timeseries import build_rollup_items, point_pk
 
 
 ENV_NAME = os.getenv("ENV_NAME", "dev")
@@ -19,161 +30,248 @@ def init_env():
     StrategyKPIsTable = dynamodb.Table(StrategyKPIsTableName)
 
 
-def fetch_json(url):
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Origin": "https://www.strategy.com",
-        "Referer": "https://www.strategy.com/",
-    }
-    r = requests.get(url, headers=headers)
+ENDPOINTS = {
+    "mstr_kpi": "https://api.microstrategy.com/btc/mstrKpiData",
+    "mstr_options": "https://api.microstrategy.com/btc/mstrOptionsData",
+    "strf_kpi": "https://api.microstrategy.com/btc/strfKpiData",
+    "strd_kpi": "https://api.microstrategy.com/btc/strdKpiData",
+    "strk_kpi": "https://api.microstrategy.com/btc/strkKpiData",
+}
+
+# (connect, read) seconds per endpoint; the Lambda itself times out at 30s
+REQUEST_TIMEOUT = (3.05, 10)
+
+_session = None
+
+
+def get_session() -> requests.Session:
+    """
+    Keep-alive session sized for one connection per endpoint, created once
+    per container and reused across warm invocations.
+    """
+    global _session
+
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0",
+                "Origin": "https://www.strategy.com",
+                "Referer": "https://www.strategy.com/",
+            }
+        )
+        adapter = HTTPAdapter(
+            pool_maxsize=len(ENDPOINTS),
+            max_retries=Retry(
+                total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+            ),
+        )
+        _session.mount("https://", adapter)
+
+    return _session
+
+
+def fetch_json(url, timeout=REQUEST_TIMEOUT):
+    r = get_session().get(url, timeout=timeout)
     r.raise_for_status()
-    return r.json()
+    # DynamoDB rejects floats, so keep numbers as Decimal from the start
+    return r.json(parse_float=Decimal)
+
+
+def fetch_endpoints(endpoints: dict) -> tuple[dict, dict]:
+    """
+    Fetches all endpoints concurrently. Returns (responses, errors) keyed by
+    endpoint name so one slow or failing endpoint doesn't sink the others.
+    """
+    responses, errors = {}, {}
+
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        futures = {
+            pool.submit(fetch_json, url): name for name, url in endpoints.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                responses[name] = future.result()
+            except Exception as e:
+                print(f"⚠️ {name} failed: {e}")
+                errors[name] = str(e)
+
+    return responses, errors
+
+
+# --- Field mapping: item attribute -> source key in the Strategy API payload ---
+MSTR_KPI_FIELDS = {
+    "price": "price",
+    "price_change_%": "priceVarPerc",
+    "3m_return_%": "threeMonth",
+    "1y_return_%": "oneYear",
+    "market_cap": "marketCap",
+    "debt": "debt",
+    "pref": "pref",
+    "historic_vol_kpi": "historicVolatility",
+    "annualized_vol_kpi": "annualizedVolatility",
+    "timestamp": "timeStampUtc",
+}
+
+MSTR_OPTIONS_FIELDS = {
+    "historic_vol_30d": "historicVolatility",
+    "implied_vol": "impliedVolatility",
+    "prev_day_iv": "prevDayImpliedVolatility",
+    "put_call_ratio": "putCallRatio",
+    "total_oi": "totalOi",
+    "call_oi": "callOi",
+    "put_oi": "putOi",
+}
+
+PREFERRED_KPI_FIELDS = {
+    "price": "price",
+    "3m_return_%": "threeMonth",
+    "1y_return_%": "oneYear",
+    "market_cap": "marketCap",
+    "historic_vol": "historicVolatility",
+    "prev_historic_vol": "prevHistoricalVolatility",
+    "mstr_cor": "mstrCor",
+    "btc_cor": "btcCor",
+    "spy_cor": "spyCor",
+    "pff_cor": "pffCor",
+    "timestamp": "timeStampUtc",
+}
+
+# ticker -> [(endpoint name, field mapping)]; a ticker is only stored when
+# every endpoint it depends on responded
+KPI_SPECS = {
+    "MSTR": [("mstr_kpi", MSTR_KPI_FIELDS), ("mstr_options", MSTR_OPTIONS_FIELDS)],
+    "STRF": [("strf_kpi", PREFERRED_KPI_FIELDS)],
+    "STRD": [("strd_kpi", PREFERRED_KPI_FIELDS)],
+    "STRK": [("strk_kpi", PREFERRED_KPI_FIELDS)],
+}
+
+# Top-level item attributes (everything else only lives in the raw blob)
+ITEM_FIELDS = [
+    "price",
+    "market_cap",
+    "implied_vol",
+    "put_call_ratio",
+    "total_oi",
+    "call_oi",
+    "put_oi",
+    "debt",
+    "pref",
+    "annualized_vol_kpi",
+    "mstr_cor",
+    "btc_cor",
+    "spy_cor",
+    "pff_cor",
+    "price_change_%",
+    "3m_return_%",
+    "1y_return_%",
+]
+
+# First present value wins for the normalized historic_vol attribute
+HISTORIC_VOL_FIELDS = ["historic_vol", "historic_vol_kpi", "historic_vol_30d"]
+
+
+def map_fields(payload, fields: dict) -> dict:
+    # *KpiData endpoints return a one-element list, mstrOptionsData a dict
+    record = payload[0] if isinstance(payload, list) else payload
+    return {name: record[source] for name, source in fields.items()}
 
 
 def fetch_all_data():
     now = datetime.utcnow().strftime("%Y-%m-%d")
+    responses, errors = fetch_endpoints(ENDPOINTS)
+    data = {}
 
-    mstr_data = {}
-    strf_data = {}
-    strd_data = {}
-    strk_data = {}
-
-    # --- MSTR ---
-    mstr_kpi_url = "https://api.microstrategy.com/btc/mstrKpiData"
-    mstr_options_url = "https://api.microstrategy.com/btc/mstrOptionsData"
-
-    mstr_kpi = fetch_json(mstr_kpi_url)[0]
-    mstr_opt = fetch_json(mstr_options_url)
-
-    mstr_data = {
-        "date": now,
-        "price": mstr_kpi["price"],
-        "price_change_%": mstr_kpi["priceVarPerc"],
-        "3m_return_%": mstr_kpi["threeMonth"],
-        "1y_return_%": mstr_kpi["oneYear"],
-        "market_cap": mstr_kpi["marketCap"],
-        "debt": mstr_kpi["debt"],
-        "pref": mstr_kpi["pref"],
-        "historic_vol_30d": mstr_opt["historicVolatility"],
-        "historic_vol_kpi": mstr_kpi["historicVolatility"],
-        "annualized_vol_kpi": mstr_kpi["annualizedVolatility"],
-        "implied_vol": mstr_opt["impliedVolatility"],
-        "prev_day_iv": mstr_opt["prevDayImpliedVolatility"],
-        "put_call_ratio": mstr_opt["putCallRatio"],
-        "total_oi": mstr_opt["totalOi"],
-        "call_oi": mstr_opt["callOi"],
-        "put_oi": mstr_opt["putOi"],
-        "timestamp": mstr_kpi["timeStampUtc"],
-    }
+    for ticker, sources in KPI_SPECS.items():
+        if any(endpoint not in responses for endpoint, _ in sources):
+            continue
 
-    # --- STRF ---
-    strf_kpi = fetch_json("https://api.microstrategy.com/btc/strfKpiData")[0]
-    strf_data = {
-        "date": now,
-        "price": strf_kpi["price"],
-        "3m_return_%": strf_kpi["threeMonth"],
-        "1y_return_%": strf_kpi["oneYear"],
-        "market_cap": strf_kpi["marketCap"],
-        "historic_vol": strf_kpi["historicVolatility"],
-        "prev_historic_vol": strf_kpi["prevHistoricalVolatility"],
-        "mstr_cor": strf_kpi["mstrCor"],
-        "btc_cor": strf_kpi["btcCor"],
-        "spy_cor": strf_kpi["spyCor"],
-        "pff_cor": strf_kpi["pffCor"],
-        "timestamp": strf_kpi["timeStampUtc"],
-    }
+        kpis = {"date": now}
+        for endpoint, fields in sources:
+            try:
+                kpis.update(map_fields(responses[endpoint], fields))
+            except (KeyError, IndexError, TypeError) as e:
+                # A payload missing a field only costs the tickers built from it
+                print(f"⚠️ {endpoint} payload unusable for {ticker}: {e!r}")
+                errors[endpoint] = f"unexpected payload: {e!r}"
+                break
+        else:
+            data[ticker] = kpis
 
-    # --- STRD ---
-    strd_kpi = fetch_json("https://api.microstrategy.com/btc/strdKpiData")[0]
-    strd_data = {
-        "date": now,
-        "price": strd_kpi["price"],
-        "3m_return_%": strd_kpi["threeMonth"],
-        "1y_return_%": strd_kpi["oneYear"],
-        "market_cap": strd_kpi["marketCap"],
-        "historic_vol": strd_kpi["historicVolatility"],
-        "prev_historic_vol": strd_kpi["prevHistoricalVolatility"],
-        "mstr_cor": strd_kpi["mstrCor"],
-        "btc_cor": strd_kpi["btcCor"],
-        "spy_cor": strd_kpi["spyCor"],
-        "pff_cor": strd_kpi["pffCor"],
-        "timestamp": strd_kpi["timeStampUtc"],
-    }
+    return data, errors
 
-    # --- STRK ---
-    strk_kpi = fetch_json("https://api.microstrategy.com/btc/strkKpiData")[0]
-    strk_data = {
-        "date": now,
-        "price": strk_kpi["price"],
-        "3m_return_%": strk_kpi["threeMonth"],
-        "1y_return_%": strk_kpi["oneYear"],
-        "market_cap": strk_kpi["marketCap"],
-        "historic_vol": strk_kpi["historicVolatility"],
-        "prev_historic_vol": strk_kpi["prevHistoricalVolatility"],
-        "mstr_cor": strk_kpi["mstrCor"],
-        "btc_cor": strk_kpi["btcCor"],
-        "spy_cor": strk_kpi["spyCor"],
-        "pff_cor": strk_kpi["pffCor"],
-        "timestamp": strk_kpi["timeStampUtc"],
-    }
 
-    return mstr_data, strf_data, strd_data, strk_data
+def encode_raw(data: dict) -> bytes:
+    return gzip.compress(json.dumps(data, separators=(",", ":"), default=str).encode())
 
 
-def write_kpi_to_dynamo(ticker: str, data: dict):
+def decode_raw(blob) -> dict:
+    """
+    Inverse of encode_raw; accepts the boto3 Binary read back from the table.
+    """
+    return json.loads(gzip.decompress(bytes(blob)), parse_float=Decimal)
+
+
+def build_kpi_item(ticker: str, data: dict) -> dict:
     item = {
-        "PK": ticker,
+        # One partition per ticker-day keeps intraday range reads to a Query
+        "PK": point_pk(ticker, data["timestamp"]),
         "SK": data["timestamp"],
+        "ticker": ticker,
         "created_at": datetime.now(UTC).isoformat(),
-        "price": data.get("price"),
-        "market_cap": data.get("market_cap"),
-        "historic_vol": (
-            data.get("historic_vol")
-            or data.get("historic_vol_kpi")
-            or data.get("historic_vol_30d")
+        "historic_vol": next(
+            (data[f] for f in HISTORIC_VOL_FIELDS if data.get(f) is not None), None
         ),
-        # Optional MSTR-only fields
-        "implied_vol": data.get("implied_vol"),
-        "put_call_ratio": data.get("put_call_ratio"),
-        "total_oi": data.get("total_oi"),
-        "call_oi": data.get("call_oi"),
-        "put_oi": data.get("put_oi"),
-        "debt": data.get("debt"),
-        "pref": data.get("pref"),
-        "annualized_vol_kpi": data.get("annualized_vol_kpi"),
-        "mstr_cor": data.get("mstr_cor"),
-        "btc_cor": data.get("btc_cor"),
-        "spy_cor": data.get("spy_cor"),
-        "pff_cor": data.get("pff_cor"),
-        "price_change_%": data.get("price_change_%"),
-        "3m_return_%": data.get("3m_return_%"),
-        "1y_return_%": data.get("1y_return_%"),
-        "raw": data,
+        **{field: data.get(field) for field in ITEM_FIELDS},
+        # Full payload as gzipped JSON rather than a nested map: a fraction of
+        # the bytes (and write units) and nothing ever queries into it
+        "raw": Binary(encode_raw(data)),
     }
 
     # Remove None fields to keep the table clean
-    item = {k: v for k, v in item.items() if v is not None}
+    return {k: v for k, v in item.items() if v is not None}
+
+
+def write_kpis_to_dynamo(data: dict, max_retries: int = 5):
+    """
+    Writes every ticker's KPI row, plus its updated hourly and daily rollups,
+    in a single BatchWriteItem call, retrying any UnprocessedItems.
+    """
+    items = [build_kpi_item(ticker, kpis) for ticker, kpis in data.items()]
+    items += build_rollup_items(StrategyKPIsTable, data) if data else []
+    pending = [{"PutRequest": {"Item": item}} for item in items]
+    client = StrategyKPIsTable.meta.client
 
-    StrategyKPIsTable.put_item(Item=item)
+    for attempt in range(max_retries + 1):
+        if not pending:
+            return
+        if attempt:
+            time.sleep(0.1 * 2**attempt)
+
+        response = client.batch_write_item(
+            RequestItems={StrategyKPIsTableName: pending}
+        )
+        pending = response.get("UnprocessedItems", {}).get(StrategyKPIsTableName, [])
+
+    if pending:
+        raise RuntimeError(f"{len(pending)} KPI rows still unprocessed")
 
 
 def handler(event=None, context=None):
     init_env()
-    mstr, strf, strd, strk = fetch_all_data()
-    write_kpi_to_dynamo("MSTR", mstr)
-    write_kpi_to_dynamo("STRF", strf)
-    write_kpi_to_dynamo("STRD", strd)
-    write_kpi_to_dynamo("STRK", strk)
+    data, errors = fetch_all_data()
+    write_kpis_to_dynamo(data)
+
+    if errors:
+        print(f"⚠️ Stored {', '.join(data)}; failed endpoints: {', '.join(errors)}")
+    else:
+        print("✅ Strategy KPIs fetched and stored successfully.")
 
-    print("✅ Strategy KPIs fetched and stored successfully.")
     return {
-        "status": "success",
-        "data": {
-            "MSTR": mstr,
-            "STRF": strf,
-            "STRD": strd,
-            "STRK": strk,
-        },
+        "status": "partial" if errors else "success",
+        "data": data,
+        "errors": errors,
     }
 
 
@@ -182,25 +280,9 @@ if __name__ == "__main__":
 
     dotenv.load_dotenv(f"cdk/.env.{os.getenv('ENV_NAME', 'dev')}", override=True)
     resp = handler()
-    mstr, strf, strd, strk = (
-        resp["data"]["MSTR"],
-        resp["data"]["STRF"],
-        resp["data"]["STRD"],
-        resp["data"]["STRK"],
-    )
-
-    print("\n📈 MSTR:")
-    for k, v in mstr.items():
-        print(f"{k}: {v}")
-
-    print("\n📘 STRF:")
-    for k, v in strf.items():
-        print(f"{k}: {v}")
-
-    print("\n📗 STRD:")
-    for k, v in strd.items():
-        print(f"{k}: {v}")
-
-    print("\n📕 STRK:")
-    for k, v in strk.items():
-        print(f"{k}: {v}")
+    icons = {"MSTR": "📈", "STRF": "📘", "STRD": "📗", "STRK": "📕"}
+
+    for ticker, data in resp["data"].items():
+        print(f"\n{icons[ticker]} {ticker}:")
+        for k, v in data.items():
+            print(f"{k}: {v}")
@@ -1,10 +1,17 @@
-import os
+import contextlib
+import hashlib
 import json
+import os
+import re
 import uuid
+from urllib.parse import unquote_plus
 from decimal import Decimal
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 import boto3
 
+from ledger import ingest_run, update_ledger
+
 ENV_NAME = os.getenv("ENV_NAME", "dev")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 TransactionsTableName = f"{ENV_NAME}-Transactions"
@@ -16,25 +23,53 @@ def init_env():
     TransactionsTable = dynamodb.Table(TransactionsTableName)
 
 
+# "07/09/2025", or "07/09/2025 as of 07/08/2025" (posted as of effective)
+DATE_FIELD_RE = re.compile(
+    r"(\d{1,2})/(\d{1,2})/(\d{4})(?:\s+as of\s+(\d{1,2})/(\d{1,2})/(\d{4}))?"
+)
+
+_AMOUNT_JUNK = str.maketrans("", "", "$,")
+
+
 def parse_amount(value):
-    return Decimal(value.replace("$", "").replace(",", "")) if value else None
+    return Decimal(value.translate(_AMOUNT_JUNK)) if value else None
 
 
 def parse_quantity(value):
+    # Decimal, not int: reinvested distributions buy fractional shares
     try:
-        return int(value.replace(",", "")) if value else None
+        return Decimal(value.translate(_AMOUNT_JUNK)) if value else None
     except Exception:
         return None
 
 
-def normalize_date_field(date_str):
+def iso_date(year, month, day, raw):
     try:
-        return datetime.strptime(date_str, "%m/%d/%Y").date().isoformat()
+        return date(int(year), int(month), int(day)).isoformat()
     except ValueError as e:
-        print(f"Error parsing date '{date_str}': {e}")
+        print(f"Error parsing date '{raw}': {e}")
         return None
 
 
+@lru_cache(maxsize=32768)
+def parse_date_field(raw: str) -> tuple:
+    """
+    (posted, effective) ISO dates from a Schwab Date field in one regex pass.
+    An export only holds a few thousand distinct Date strings, so each is
+    parsed once and served from the cache after that.
+    """
+    match = DATE_FIELD_RE.fullmatch(raw.strip())
+    if not match:
+        print(f"Error parsing date '{raw}'")
+        return None, None
+
+    month, day, year, as_of_month, as_of_day, as_of_year = match.groups()
+    posted = iso_date(year, month, day, raw)
+    if as_of_year is None:
+        return posted, posted
+    return posted, iso_date(as_of_year, as_of_month, as_of_day, raw)
+
+
 def generate_sk(effective_date, symbol, action):
     parts = [effective_date]
     if symbol:
@@ -44,64 +79,231 @@ def generate_sk(effective_date, symbol, action):
     return "#".join(parts)
 
 
-def write_transactions_to_dynamo(transactions):
-    with TransactionsTable.batch_writer(overwrite_by_pkeys=["PK"]) as batch:
-        for txn in transactions:
-            if "as of" in txn["Date"]:
-                effective_date = normalize_date_field(
-                    txn["Date"].split("as of")[1].strip()
-                )
-                posted_date = normalize_date_field(
-                    txn["Date"].split("as of")[0].strip()
-                )
-            else:
-                # Fallback if "as of" is not present
-                effective_date = normalize_date_field(txn["Date"])
-                posted_date = effective_date
-
-            pk = uuid.uuid3(uuid.NAMESPACE_DNS, json.dumps(txn)).hex
-            sk = generate_sk(effective_date, txn.get("Symbol"), txn.get("Action"))
-
-            item = {
-                "PK": pk,
-                "SK": sk,
-                "Action": txn.get("Action"),
-                "Symbol": txn.get("Symbol") or None,
-                "Description": txn.get("Description"),
-                "Quantity": parse_quantity(txn.get("Quantity")),
-                "Price": parse_amount(txn.get("Price")),
-                "FeesAndCommission": parse_amount(txn.get("Fees & Comm")),
-                "Amount": parse_amount(txn.get("Amount")),
-                "PostedDate": posted_date,
-                "EffectiveDate": effective_date,
-                "RawDateField": txn["Date"],
-                "Source": "Schwab JSON",
+# Fields that identify a transaction. Fixed rather than "every key" so a new
+# column in a future Schwab export doesn't change every fingerprint.
+FINGERPRINT_FIELDS = [
+    "Date",
+    "Action",
+    "Symbol",
+    "Description",
+    "Quantity",
+    "Price",
+    "Fees & Comm",
+    "Amount",
+]
+
+# BatchGetItem accepts at most 100 keys per call
+CHUNK_SIZE = 100
+
+
+def canonical_key(txn: dict) -> str:
+    return "|".join(
+        " ".join(str(txn.get(field) or "").split()) for field in FINGERPRINT_FIELDS
+    )
+
+
+def fingerprint(txn: dict, occurrence: int = 0) -> str:
+    """
+    Stable id for a transaction: independent of key order and whitespace.
+    Identical rows in one export (e.g. two equal fills on the same day) are
+    told apart by their occurrence number, so re-importing the same or an
+    overlapping export maps every row to the same key again.
+    """
+    canonical = canonical_key(txn)
+    if occurrence:
+        canonical += f"|{occurrence}"
+    return uuid.uuid5(uuid.NAMESPACE_URL, canonical).hex
+
+
+def legacy_key(txn: dict) -> str:
+    """
+    PK the ingest used before fingerprints: a uuid3 of the raw JSON row.
+    Rows stored under it are still recognised, so re-importing an export
+    ingested back then doesn't write a second copy. (json.load gave floats
+    where ijson gives Decimals; default=float serialises them the same way.)
+    """
+    return uuid.uuid3(uuid.NAMESPACE_DNS, json.dumps(txn, default=float)).hex
+
+
+def build_item(txn: dict, occurrence: int = 0, ingested_at: str = None) -> dict:
+    posted_date, effective_date = parse_date_field(txn["Date"])
+
+    item = {
+        "PK": fingerprint(txn, occurrence),
+        "SK": generate_sk(effective_date, txn.get("Symbol"), txn.get("Action")),
+        "Action": txn.get("Action"),
+        "Symbol": txn.get("Symbol") or None,
+        "Description": txn.get("Description"),
+        "Quantity": parse_quantity(txn.get("Quantity")),
+        "Price": parse_amount(txn.get("Price")),
+        "FeesAndCommission": parse_amount(txn.get("Fees & Comm")),
+        "Amount": parse_amount(txn.get("Amount")),
+        "PostedDate": posted_date,
+        "EffectiveDate": effective_date,
+        "RawDateField": txn["Date"],
+        "Source": "Schwab JSON",
+        # Sort key of the ingested-index GSI the ledger reads new rows from
+        "IngestedAt": ingested_at,
+    }
+
+    return {k: v for k, v in item.items() if v is not None}
+
+
+def iter_items(transactions, ingested_at: str = None):
+    """
+    Lazily turns raw export rows into (table item, legacy PK) pairs,
+    numbering repeats of the same fingerprint. Repeats are counted by a
+    16-byte digest of the row, not the row itself, so a long export costs
+    a few dozen bytes per distinct row.
+    """
+    seen = {}
+    for txn in transactions:
+        digest = hashlib.sha256(canonical_key(txn).encode()).digest()[:16]
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        yield build_item(txn, occurrence, ingested_at), legacy_key(txn)
+
+
+def iter_chunks(items, size: int = CHUNK_SIZE):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def existing_keys(keys: list[tuple]) -> set:
+    """
+    (PK, SK) pairs from `keys` that are already in the table. A keys-only
+    BatchGetItem costs a fraction of rewriting the rows.
+    """
+    found = set()
+    for chunk in iter_chunks(keys):
+        request = {
+            TransactionsTableName: {
+                "Keys": [{"PK": pk, "SK": sk} for pk, sk in chunk],
+                "ProjectionExpression": "PK, SK",
             }
+        }
+        while request:
+            client = TransactionsTable.meta.client
+            response = client.batch_get_item(RequestItems=request)
+            for key in response["Responses"].get(TransactionsTableName, []):
+                found.add((key["PK"], key["SK"]))
+            request = response.get("UnprocessedKeys")
+    return found
+
+
+def write_transactions_to_dynamo(transactions) -> dict:
+    """
+    Streams `transactions` (any iterable) into the table in chunks of 100,
+    skipping rows already stored under either their fingerprint or their
+    legacy key. Occurrence numbering keeps every (PK, SK) in one export
+    distinct, so nothing beyond the current chunk is held in memory.
+    """
+    written = skipped = 0
+
+    with (
+        ingest_run(TransactionsTable) as ingested_at,
+        TransactionsTable.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch,
+    ):
+        for chunk in iter_chunks(iter_items(transactions, ingested_at)):
+            unique = {
+                (item["PK"], item["SK"]): (item, (legacy_pk, item["SK"]))
+                for item, legacy_pk in chunk
+            }
+
+            # Repeats of one row share a legacy key; BatchGetItem rejects
+            # duplicate keys in a request
+            lookups = dict.fromkeys(
+                k for key, (_, legacy) in unique.items() for k in (key, legacy)
+            )
+            stored = existing_keys(list(lookups)) if unique else set()
+
+            for key, (item, legacy) in unique.items():
+                if key in stored or legacy in stored:
+                    skipped += 1
+                    continue
+                batch.put_item(Item=item)
+                written += 1
+
+    print(
+        f"Wrote {written} transactions to {TransactionsTableName} "
+        f"({skipped} already present)."
+    )
+    return {"written": written, "skipped": skipped}
 
-            item = {k: v for k, v in item.items() if v is not None}
-            batch.put_item(Item=item)
 
-    print(f"Wrote {len(transactions)} transactions to {TransactionsTableName}.")
+def iter_export_transactions(stream):
+    """
+    Yields BrokerageTransactions from a Schwab export one at a time, so memory
+    stays flat however many years the export covers. `stream` is any binary
+    file-like object: an open file or an S3 StreamingBody.
+    """
+    import ijson
+
+    yield from ijson.items(stream, "BrokerageTransactions.item")
+
+
+def open_export(bucket: str, key: str):
+    """
+    Opens an export object for streaming. With LOCAL_S3_ROOT set the object
+    is read from <root>/<bucket>/<key> on disk instead, for local runs.
+    """
+    local_root = os.getenv("LOCAL_S3_ROOT")
+    if local_root:
+        return open(os.path.join(local_root, bucket, key), "rb")
+
+    s3 = boto3.client("s3", region_name=AWS_REGION)
+    return s3.get_object(Bucket=bucket, Key=key)["Body"]
 
 
 def handler(event, context):
+    # Small inline imports; anything larger goes through the exports bucket
+    init_env()
     transactions = event.get("transactions", [])
-    write_transactions_to_dynamo(transactions)
-    return {"status": "success", "count": len(transactions)}
+    counts = write_transactions_to_dynamo(transactions)
+    if counts["written"]:
+        update_ledger(TransactionsTable)
+    return {"status": "success", "count": len(transactions), **counts}
 
 
-def main():
-    json_file = "Limit_Liability_Company_XXX003_Transactions_20250709-111042.json"
-    with open(json_file, "r") as f:
-        data = json.load(f)
+def s3_handler(event, context):
+    """
+    ObjectCreated trigger on the exports bucket: streams each uploaded export
+    straight from S3 into the table.
+    """
+    init_env()
+    results = []
 
-    transactions = data.get("BrokerageTransactions", [])
-    write_transactions_to_dynamo(transactions)
+    for record in event.get("Records", []):
+        bucket = record["s3"]["bucket"]["name"]
+        key = unquote_plus(record["s3"]["object"]["key"])
+
+        with contextlib.closing(open_export(bucket, key)) as body:
+            counts = write_transactions_to_dynamo(iter_export_transactions(body))
+        results.append({"bucket": bucket, "key": key, **counts})
+
+    if any(r["written"] for r in results):
+        update_ledger(TransactionsTable)
+    return {"status": "success", "objects": results}
+
+
+def main(json_file="Limit_Liability_Company_XXX003_Transactions_20250709-111042.json"):
+    with open(json_file, "rb") as f:
+        counts = write_transactions_to_dynamo(iter_export_transactions(f))
+    if counts["written"]:
+        update_ledger(TransactionsTable)
 
 
 if __name__ == "__main__":
+    import sys
+
     import dotenv
 
     dotenv.load_dotenv(f"cdk/.env.{os.getenv('ENV_NAME', 'dev')}", override=True)
     init_env()
-    main()
+    main(*sys.argv[1:2])
@@ -0,0 +1,415 @@
+"""
+Position and cost-basis ledger over the Transactions table.
+
+Rows are applied in EffectiveDate order. The running state (per-symbol
+quantity, cost basis, realized P&L and distribution income, plus cash) lives in
+the same table:
+
+    PK = LEDGER   SK = STATE                 current portfolio + watermark
+    PK = LEDGER   SK = SNAPSHOT#2025-07-09   portfolio as of that date
+    PK = LEDGER   SK = RUN#<IngestedAt>#id   an ingest, running or finished
+
+Each update only reads rows ingested after the stored watermark (via the
+ingested-index GSI), so reports never scan Transactions. Every row of an
+ingest carries the IngestedAt stamped when it started, so rows of a run that
+is still writing can land below a watermark another run has already moved
+past. Ingests therefore register themselves for as long as they write
+(ingest_run), and an update applies rows stamped up to the newest finished
+run but before the oldest one still running. Finished registrations are
+removed once the watermark has passed them. STATE is written with a version
+check, so concurrent updates can't overwrite each other; the loser reloads
+and retries.
+
+Rows written before IngestedAt existed aren't in the GSI, so the first update
+(no versioned STATE yet) rebuilds from a full scan.
+
+Closed positions are folded into a `closed` total (realized P&L and
+distributions) before writing, so STATE and snapshots only grow with the
+symbols actually held.
+"""
+
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, UTC
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import Attr, Key
+
+LEDGER_PK = "LEDGER"
+STATE_SK = "STATE"
+SNAPSHOT_PREFIX = "SNAPSHOT#"
+RUN_PREFIX = "RUN#"
+
+# A registration older than this belongs to a run that died. Well past the
+# 15 minute Lambda limit, so long local imports are covered too; a dead run
+# only holds back newer rows until it expires.
+RUN_TIMEOUT = timedelta(hours=1)
+SAVE_ATTEMPTS = 5
+
+INGESTED_INDEX = "ingested-index"
+SOURCE = "Schwab JSON"
+
+BUY_ACTIONS = {"Buy", "Reinvest Shares", "Buy to Open", "Buy to Close"}
+SELL_ACTIONS = {"Sell", "Sell Short", "Sell to Open", "Sell to Close"}
+CLOSE_ACTIONS = {"Expired", "Assigned", "Exchange or Exercise"}
+DISTRIBUTION_ACTIONS = {
+    "Qualified Dividend",
+    "Non-Qualified Div",
+    "Cash Dividend",
+    "Special Dividend",
+    "Reinvest Dividend",
+    "Qual Div Reinvest",
+    "Pr Yr Div Reinvest",
+    "Pr Yr Non-Qual Div",
+    "Long Term Cap Gain",
+    "Short Term Cap Gain",
+    "Return Of Capital",
+}
+
+# Same-day rows: open/add before reducing so a day trade never goes negative
+ACTION_ORDER = {action: 0 for action in BUY_ACTIONS}
+
+ZERO = Decimal(0)
+
+
+def timestamp(at: datetime = None) -> str:
+    # Fixed precision so timestamps compare correctly as strings
+    return (at or datetime.now(UTC)).isoformat(timespec="microseconds")
+
+
+def sort_key(txn: dict) -> tuple:
+    return (
+        txn["EffectiveDate"],
+        ACTION_ORDER.get(txn.get("Action"), 1),
+        txn.get("SK", ""),
+        txn.get("PK", ""),
+    )
+
+
+def new_position() -> dict:
+    return {
+        "quantity": ZERO,
+        "cost_basis": ZERO,
+        "realized_pnl": ZERO,
+        "distributions": ZERO,
+    }
+
+
+def new_closed() -> dict:
+    return {"realized_pnl": ZERO, "distributions": ZERO}
+
+
+class Ledger:
+    """
+    Signed average-cost ledger: cost_basis is the net cash paid for the open
+    quantity (negative for short option positions), so closing trades in
+    either direction realize `cash - released cost`.
+    """
+
+    def __init__(self, state: dict = None):
+        state = state or {}
+        self.positions = defaultdict(
+            new_position,
+            {
+                symbol: {field: position[field] for field in new_position()}
+                for symbol, position in state.get("positions", {}).items()
+            },
+        )
+        self.closed = {**new_closed(), **state.get("closed", {})}
+        self.cash = state.get("cash", ZERO)
+        self.as_of = state.get("as_of", "")
+        self.watermark = state.get("watermark", "")
+        self.rows = int(state.get("rows", 0))
+        self.version = int(state.get("version", 0))
+
+    def apply(self, txn: dict):
+        action = txn.get("Action")
+        symbol = txn.get("Symbol")
+        amount = txn.get("Amount", ZERO)
+        quantity = abs(txn.get("Quantity", ZERO))
+
+        self.cash += amount
+        self.as_of = max(self.as_of, txn["EffectiveDate"])
+        self.rows += 1
+
+        if not symbol:
+            return
+
+        if action in BUY_ACTIONS:
+            self._trade(self.positions[symbol], quantity, amount)
+        elif action in SELL_ACTIONS:
+            self._trade(self.positions[symbol], -quantity, amount)
+        elif action in CLOSE_ACTIONS and symbol in self.positions:
+            position = self.positions[symbol]
+            self._trade(position, -position["quantity"], amount)
+        elif action in DISTRIBUTION_ACTIONS:
+            position = self.positions[symbol]
+            position["distributions"] += amount
+            if action == "Return Of Capital":
+                position["cost_basis"] -= amount
+
+    @staticmethod
+    def _trade(position: dict, quantity: Decimal, cash: Decimal):
+        held = position["quantity"]
+        if not quantity:
+            return
+
+        if not held or (held > 0) == (quantity > 0):
+            position["quantity"] = held + quantity
+            position["cost_basis"] -= cash
+            return
+
+        closing = min(abs(quantity), abs(held))
+        released = position["cost_basis"] * closing / abs(held)
+        closing_cash = cash * closing / abs(quantity)
+
+        position["realized_pnl"] += closing_cash - released
+        position["cost_basis"] -= released
+        position["quantity"] = held + (closing if quantity > 0 else -closing)
+
+        # Anything beyond the held quantity opens a position the other way
+        if abs(quantity) > closing:
+            position["quantity"] += quantity - (closing if quantity > 0 else -closing)
+            position["cost_basis"] = -(cash - closing_cash)
+
+    def portfolio(self) -> dict:
+        positions, closed = {}, dict(self.closed)
+        for symbol, position in self.positions.items():
+            quantity = position["quantity"]
+            if not quantity and not position["cost_basis"]:
+                for field in closed:
+                    closed[field] += position[field]
+                continue
+            positions[symbol] = {
+                **position,
+                "avg_cost": (
+                    (position["cost_basis"] / quantity).quantize(Decimal("0.000001"))
+                    if quantity
+                    else ZERO
+                ),
+            }
+        return {
+            "as_of": self.as_of,
+            "watermark": self.watermark,
+            "rows": self.rows,
+            "cash": self.cash,
+            "positions": positions,
+            "closed": closed,
+        }
+
+    def to_item(self, sk: str) -> dict:
+        return {"PK": LEDGER_PK, "SK": sk, **self.portfolio()}
+
+    def save(self, table, snapshots: list[dict]):
+        """
+        Writes STATE only if no other update has since, then the snapshots.
+        Raises ConditionalCheckFailedException otherwise.
+        """
+        item = {**self.to_item(STATE_SK), "version": self.version + 1}
+        # STATE written before versions existed has no version attribute
+        unchanged = (
+            Attr("version").eq(self.version)
+            if self.version
+            else Attr("version").not_exists()
+        )
+        table.put_item(Item=item, ConditionExpression=unchanged)
+        self.version += 1
+
+        with table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+            for snapshot in snapshots:
+                batch.put_item(Item=snapshot)
+
+
+def load_ledger(table) -> Ledger:
+    response = table.get_item(Key={"PK": LEDGER_PK, "SK": STATE_SK})
+    return Ledger(response.get("Item"))
+
+
+def query_all(table, **kwargs) -> list[dict]:
+    response = table.query(**kwargs)
+    items = response.get("Items", [])
+    while "LastEvaluatedKey" in response:
+        response = table.query(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+        items.extend(response.get("Items", []))
+    return items
+
+
+@contextmanager
+def ingest_run(table):
+    """
+    Registers an ingest for as long as it writes rows and yields the
+    IngestedAt to stamp them with. On the way out the registration is marked
+    finished (the batch writer must already be flushed), which lets the next
+    update apply this run's rows.
+    """
+    ingested_at = timestamp()
+    key = {"PK": LEDGER_PK, "SK": f"{RUN_PREFIX}{ingested_at}#{uuid.uuid4().hex}"}
+    table.put_item(Item={**key, "started": ingested_at})
+    try:
+        yield ingested_at
+    finally:
+        table.update_item(
+            Key=key,
+            UpdateExpression="SET finished = :now",
+            ExpressionAttributeValues={":now": timestamp()},
+        )
+
+
+class IngestWindow:
+    """
+    Which stamped rows are completely written: those stamped no later than
+    the newest finished run and before the oldest run still writing. A run
+    registers before writing anything, so a run this read doesn't see yet
+    starts after every run it does see has finished.
+    """
+
+    def __init__(self, runs: list[dict], now: datetime = None):
+        expired = timestamp((now or datetime.now(UTC)) - RUN_TIMEOUT)
+        self.done = [r for r in runs if "finished" in r or r["started"] <= expired]
+        running = [r["started"] for r in runs if r not in self.done]
+        self.through = max((r["started"] for r in self.done), default="")
+        self.before = min(running, default=None)
+
+    def complete(self, stamp: str) -> bool:
+        return stamp <= self.through and (self.before is None or stamp < self.before)
+
+    def watermark(self, applied: str) -> str:
+        """
+        Everything up to `through` is applied unless a running run holds
+        part of it back; then only what was actually applied.
+        """
+        if self.before is None or self.through < self.before:
+            return self.through
+        return applied
+
+
+def ingest_window(table) -> IngestWindow:
+    runs = query_all(
+        table,
+        KeyConditionExpression=Key("PK").eq(LEDGER_PK)
+        & Key("SK").begins_with(RUN_PREFIX),
+        ConsistentRead=True,
+    )
+    return IngestWindow(runs)
+
+
+def remove_finished_runs(table, window: IngestWindow, watermark: str):
+    with table.batch_writer() as batch:
+        for run in window.done:
+            if run["started"] <= watermark:
+                batch.delete_item(Key={"PK": run["PK"], "SK": run["SK"]})
+
+
+def new_transactions(table, watermark: str, window: IngestWindow) -> list[dict]:
+    """
+    Rows stamped after `watermark` that `window` says are complete, read from
+    the ingested-index GSI.
+    """
+    if not window.through or window.through <= watermark:
+        return []
+    key = Key("Source").eq(SOURCE)
+    if watermark:
+        key &= Key("IngestedAt").between(watermark, window.through)
+    else:
+        key &= Key("IngestedAt").lte(window.through)
+    rows = query_all(table, IndexName=INGESTED_INDEX, KeyConditionExpression=key)
+    return [
+        r
+        for r in rows
+        if r["IngestedAt"] > watermark and window.complete(r["IngestedAt"])
+    ]
+
+
+def all_transactions(table) -> list[dict]:
+    """
+    Every transaction row, including any written before IngestedAt existed.
+    Only used for a full rebuild.
+    """
+    kwargs = {"FilterExpression": Attr("EffectiveDate").exists()}
+    response = table.scan(**kwargs)
+    items = response.get("Items", [])
+    while "LastEvaluatedKey" in response:
+        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+        items.extend(response.get("Items", []))
+    return items
+
+
+def update_ledger(table, rebuild: bool = False) -> Ledger:
+    """
+    Applies rows ingested since the stored watermark and writes the new state
+    plus a snapshot for every EffectiveDate touched. A row dated before the
+    ledger's as_of (a late "as of" correction) would change average costs that
+    were already reported, so that case replays everything from scratch.
+    If another update saves first, this one starts over from its state.
+    """
+    for _ in range(SAVE_ATTEMPTS):
+        try:
+            return apply_new_rows(table, rebuild)
+        except table.meta.client.exceptions.ConditionalCheckFailedException:
+            print("🔁 Ledger updated concurrently; retrying")
+    raise RuntimeError(f"Ledger update lost {SAVE_ATTEMPTS} races in a row")
+
+
+def apply_new_rows(table, rebuild: bool) -> Ledger:
+    ledger = load_ledger(table)
+    window = ingest_window(table)
+    if not ledger.version:
+        # No versioned STATE yet: pre-IngestedAt rows are only found by a scan
+        rebuild = True
+    if rebuild:
+        # Keep the version so the save still detects concurrent updates
+        ledger = Ledger({"version": ledger.version})
+        rows = [
+            r
+            for r in all_transactions(table)
+            if "IngestedAt" not in r or window.complete(r["IngestedAt"])
+        ]
+    else:
+        rows = new_transactions(table, ledger.watermark, window)
+        if rows and min(r["EffectiveDate"] for r in rows) < ledger.as_of:
+            print("↩️ Backdated transactions found; rebuilding ledger")
+            return apply_new_rows(table, rebuild=True)
+
+    # Snapshot the state at the end of each EffectiveDate
+    snapshots, day = [], None
+    for txn in sorted(rows, key=sort_key):
+        if day and txn["EffectiveDate"] != day:
+            snapshots.append(ledger.to_item(SNAPSHOT_PREFIX + day))
+        ledger.apply(txn)
+        day = txn["EffectiveDate"]
+    if day:
+        snapshots.append(ledger.to_item(SNAPSHOT_PREFIX + day))
+
+    applied = max((r.get("IngestedAt", "") for r in rows), default="")
+    watermark = max(ledger.watermark, window.watermark(applied))
+    if rows or watermark != ledger.watermark:
+        ledger.watermark = watermark
+        ledger.save(table, snapshots)
+    remove_finished_runs(table, window, ledger.watermark)
+
+    if rows:
+        print(
+            f"📒 Ledger applied {len(rows)} transactions through {ledger.as_of} "
+            f"({len(snapshots)} snapshots)"
+        )
+    return ledger
+
+
+def get_portfolio(table, as_of: str = None) -> dict:
+    """
+    Current portfolio, or the latest snapshot on or before `as_of`
+    (YYYY-MM-DD). Either way a single read.
+    """
+    if as_of is None:
+        response = table.get_item(Key={"PK": LEDGER_PK, "SK": STATE_SK})
+        return response.get("Item")
+
+    response = table.query(
+        KeyConditionExpression=Key("PK").eq(LEDGER_PK)
+        & Key("SK").between(SNAPSHOT_PREFIX, SNAPSHOT_PREFIX + as_of),
+        ScanIndexForward=False,
+        Limit=1,
+    )
+    items = response.get("Items", [])
+    return items[0] if items else None
@@ -1,8 +1,19 @@
+# ruff: noqa: E402
+import time
+
+# Module import time (Powertools, boto3, handlers) is reported separately
+# from the lazy client/secret init that happens on the first request
+IMPORT_STARTED = time.perf_counter()
+
 import os
 import json
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
 from handlers.signup import main as signup
+import registry
+from instrumentation import latency_middleware, metrics
+
+IMPORT_MS = round((time.perf_counter() - IMPORT_STARTED) * 1000, 2)
 
 ENV_NAME = os.environ.get("ENV_NAME", "dev")
 ENV_TYPE = os.environ.get("ENV_TYPE", "dev")
@@ -12,6 +23,8 @@ isProd = ENV_TYPE == "prd" and ENV_NAME == "prd"
 
 logger = Logger(service="userservice", level="INFO")
 
+cold_start = True
+
 
 def get_resolver() -> APIGatewayRestResolver:
     cors_config = CORSConfig(
@@ -34,7 +47,8 @@ def get_resolver() -> APIGatewayRestResolver:
         cors=cors_config,
         serializer=lambda obj: json.dumps(obj, default=str),
     )
-    app.use([add_csp_header])
+    # latency_middleware first so its timing includes the rest of the chain
+    app.use([latency_middleware, add_csp_header])
 
     return app
 
@@ -53,9 +67,30 @@ def signup_handler():
     return signup(app.current_event, app.lambda_context)
 
 
+def report_cold_start():
+    global cold_start
+
+    if not cold_start:
+        return
+    cold_start = False
+
+    logger.info(
+        "Cold start",
+        extra={
+            "import_ms": IMPORT_MS,
+            "init_ms": round(sum(registry.init_timings.values()), 2),
+            "init_breakdown_ms": dict(registry.init_timings),
+        },
+    )
+
+
 @logger.inject_lambda_context
+@metrics.log_metrics
 def main(event, context):
     logger.info("API.main event", extra={"event": event})
-    if "detail-type" in event and event["detail-type"] == "Scheduled Event":
-        return "ping request"
-    return app.resolve(event, context)
+    try:
+        if "detail-type" in event and event["detail-type"] == "Scheduled Event":
+            return "ping request"
+        return app.resolve(event, context)
+    finally:
+        report_cold_start()
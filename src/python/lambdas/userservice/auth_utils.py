@@ -1,41 +1,55 @@
-import hashlib
-import json
 import os
+from datetime import UTC, datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from functools import lru_cache
-from uuid import uuid4
 
-import boto3
 from botocore.exceptions import ClientError
 
+import password_hashing
+import registry
+
 ENV_NAME = os.environ.get("ENV_NAME", "dev")
 
 
-@lru_cache(maxsize=None)
 def get_secret(secret_name, to_dict=False, region_name="us-east-1"):
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(service_name="secretsmanager", region_name=region_name)
+    # Cached per container and re-read after SECRET_TTL_SECONDS
+    return registry.get_secret(secret_name, to_dict=to_dict, region_name=region_name)
 
-    try:
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-    except ClientError as e:
-        raise e
 
-    if to_dict:
-        return json.loads(get_secret_value_response["SecretString"])
-    else:
-        return get_secret_value_response["SecretString"]
+def hash_password(password, pepper):
+    # Encoded "<algorithm>$<cost>$..." string; no separate salt attribute
+    return password_hashing.get_hasher().hash(password, pepper)
 
 
-def hash_password(password, pepper, salt=None):
-    if not salt:
-        salt = uuid4().hex
+def check_password(table, user, password, pepper):
+    """
+    Verifies a login against the stored user item. When the stored hash is a
+    legacy SHA-512 one, or was made with an older cost, it is replaced with a
+    fresh hash of the now-known password. The update is conditional on the
+    old hash so a concurrent password change isn't overwritten.
+    """
+    matches, needs_rehash = password_hashing.verify_password(
+        password, pepper, user["hashed_password"], user.get("password_salt")
+    )
+    if not matches or not needs_rehash:
+        return matches
 
-    combined = password + salt + pepper
-    hashed_password = hashlib.sha512(combined.encode()).hexdigest()
-    return salt, hashed_password
+    try:
+        table.update_item(
+            Key={"PK": user["PK"], "SK": user["SK"]},
+            UpdateExpression="SET hashed_password = :new, updated_at = :now "
+            "REMOVE password_salt",
+            ConditionExpression="hashed_password = :old",
+            ExpressionAttributeValues={
+                ":new": hash_password(password, pepper),
+                ":old": user["hashed_password"],
+                ":now": datetime.now(UTC).isoformat(),
+            },
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+    return True
 
 
 def send_email_confirmation_code(
@@ -48,7 +62,7 @@ def send_email_confirmation_code(
             "Body": {"Text": {"Data": f"Your confirmation code is {code}"}},
         }
 
-    ses = boto3.client("ses")
+    ses = registry.get_client("ses")
 
     # Prepare the HTML content (no image included)
     html = f"""
@@ -0,0 +1,81 @@
+"""
+One item per registered email, so uniqueness is enforced by DynamoDB rather
+than by a read before the write.
+
+Signup puts EMAIL#<email> with attribute_not_exists(PK) in the same
+transaction as the user; a second signup for the same email cancels the whole
+transaction instead of racing past an email-index query. Users created before
+the claims existed are covered by running the backfill once per table:
+
+    python email_claims.py dev-UserService
+"""
+
+import sys
+
+from boto3.dynamodb.conditions import Attr
+
+EMAIL_PREFIX = "EMAIL#"
+EMAIL_SK = "CLAIM"
+
+
+CLAIM_CONDITION = "attribute_not_exists(PK)"
+
+
+def claim_item(email: str, user_id: str) -> dict:
+    return {"PK": f"{EMAIL_PREFIX}{email}", "SK": EMAIL_SK, "user_id": user_id}
+
+
+def claim_put(table_name: str, email: str, user_id: str) -> dict:
+    """
+    TransactItems entry that fails the transaction when `email` is taken.
+    """
+    return {
+        "Put": {
+            "TableName": table_name,
+            "Item": claim_item(email, user_id),
+            "ConditionExpression": CLAIM_CONDITION,
+        }
+    }
+
+
+def claim_failed(error, index: int = 0) -> bool:
+    """
+    Whether a TransactionCanceledException was caused by the claim at
+    TransactItems[index], rather than a conflict or throttle worth retrying.
+    """
+    reasons = error.response.get("CancellationReasons", [])
+    return len(reasons) > index and reasons[index].get("Code") == (
+        "ConditionalCheckFailed"
+    )
+
+
+def backfill(table) -> int:
+    """
+    Claims the email of every existing user. Safe to re-run; emails already
+    claimed are left alone.
+    """
+    client = table.meta.client
+    kwargs = {"FilterExpression": Attr("SK").eq("USER")}
+    claimed = 0
+    while True:
+        response = table.scan(**kwargs)
+        for user in response.get("Items", []):
+            if not user.get("email"):
+                continue
+            try:
+                table.put_item(
+                    Item=claim_item(user["email"], user["PK"]),
+                    ConditionExpression=CLAIM_CONDITION,
+                )
+                claimed += 1
+            except client.exceptions.ConditionalCheckFailedException:
+                pass
+        if "LastEvaluatedKey" not in response:
+            return claimed
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+if __name__ == "__main__":
+    import registry
+
+    print(f"claimed {backfill(registry.get_table(sys.argv[1]))} emails")
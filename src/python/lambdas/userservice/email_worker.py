@@ -0,0 +1,96 @@
+"""
+Delivers confirmation emails from the UserService outbox.
+
+Triggered by the table stream (INSERTs of OUTBOX# items only). Each batch is
+sent concurrently over one SES client; delivered items are deleted, failures
+are returned as batchItemFailures so Lambda retries just those. Outbox items
+that no longer exist were delivered by an earlier attempt and are skipped, so
+a retried batch doesn't send duplicates.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from aws_lambda_powertools import Logger
+from boto3.dynamodb.types import TypeDeserializer
+
+import registry
+from auth_utils import send_email_confirmation_code
+from outbox import DEFAULT_SOURCE, OUTBOX_PREFIX
+
+logger = Logger(service="user.email_worker")
+
+ENV_NAME = os.environ.get("ENV_NAME", "dev")
+table_name = f"{ENV_NAME}-UserService"
+
+MAX_WORKERS = 8
+
+_deserializer = TypeDeserializer()
+
+
+def outbox_records(event: dict) -> list[tuple[str, dict]]:
+    records = []
+    for record in event.get("Records", []):
+        if record.get("eventName") != "INSERT":
+            continue
+        image = record["dynamodb"].get("NewImage", {})
+        item = {k: _deserializer.deserialize(v) for k, v in image.items()}
+        if item.get("PK", "").startswith(OUTBOX_PREFIX):
+            records.append((record["dynamodb"]["SequenceNumber"], item))
+    return records
+
+
+def pending_keys(table, items: list[dict]) -> set:
+    keys = {(item["PK"], item["SK"]) for item in items}
+    request = {
+        table.name: {
+            "Keys": [{"PK": pk, "SK": sk} for pk, sk in keys],
+            "ProjectionExpression": "PK, SK",
+        }
+    }
+    found = set()
+    while request:
+        response = table.meta.client.batch_get_item(RequestItems=request)
+        for key in response["Responses"].get(table.name, []):
+            found.add((key["PK"], key["SK"]))
+        request = response.get("UnprocessedKeys")
+    return found
+
+
+def deliver(item: dict):
+    send_email_confirmation_code(
+        item["email"], item["code"], item.get("source", DEFAULT_SOURCE)
+    )
+
+
+def handler(event, context):
+    records = outbox_records(event)
+    if not records:
+        return {"batchItemFailures": []}
+
+    table = registry.get_table(table_name)
+    pending = pending_keys(table, [item for _, item in records])
+    records = [
+        (seq, item) for seq, item in records if (item["PK"], item["SK"]) in pending
+    ]
+
+    sent, failures = [], []
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(records) or 1)) as pool:
+        futures = {pool.submit(deliver, item): (seq, item) for seq, item in records}
+        for future in as_completed(futures):
+            seq, item = futures[future]
+            try:
+                future.result()
+                sent.append(item)
+            except Exception:
+                logger.exception("Email delivery failed", extra={"outbox": item["PK"]})
+                failures.append(seq)
+
+    with table.batch_writer() as batch:
+        for item in sent:
+            batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+
+    logger.info(
+        "Outbox batch processed", extra={"sent": len(sent), "failed": len(failures)}
+    )
+    return {"batchItemFailures": [{"itemIdentifier": seq} for seq in failures]}
@@ -4,7 +4,6 @@ import time
 import uuid
 from datetime import UTC, datetime
 from uuid import uuid4
-import boto3
 
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
@@ -12,17 +11,19 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from auth_utils import (
     get_secret,
     hash_password,
-    send_email_confirmation_code,
 )
 
+from email_claims import claim_failed, claim_put
+from instrumentation import timed
+from outbox import outbox_item
+import registry
+
 logger = Logger(service="user.signup")
-pepper = get_secret(secret_name="baselayercapital/PEPPER")
 
 ENV_NAME = os.environ["ENV_NAME"]
 ENV_TYPE = os.environ["ENV_TYPE"]
 
 table_name = f"{ENV_NAME}-UserService"
-table = boto3.resource("dynamodb").Table(table_name)
 
 
 def main(current_event: APIGatewayProxyEvent, current_context: LambdaContext):
@@ -47,38 +48,50 @@ def main(current_event: APIGatewayProxyEvent, current_context: LambdaContext):
             "error": "password is required",
         }, 400
 
-    response = table.query(
-        IndexName="email-index",
-        KeyConditionExpression=boto3.dynamodb.conditions.Key("email").eq(email),
-        Limit=1,
-    )
-    items = response.get("Items", [])
-    if items:
-        logger.error("Email already exists", extra={"email": email})
-        return {
-            "error": "Email already exists",
-        }, 400
+    # Built on first use, then reused by every warm invocation
+    table = registry.get_table(table_name)
+    pepper = get_secret(secret_name="baselayercapital/PEPPER")
 
-    # Hash the password and retrieve the salt
-    password_salt, hashed_password = hash_password(password, pepper)
+    # Salt and cost parameters are embedded in the encoded hash
+    with timed("PasswordHash"):
+        hashed_password = hash_password(password, pepper)
 
     user_id = str(uuid4())
     confirmation_code = "".join([str(random.randint(0, 9)) for _ in range(6)])
-    table.put_item(
-        Item={
-            "PK": user_id,
-            "SK": "USER",
-            "email": email,
-            "password_salt": password_salt,
-            "hashed_password": hashed_password,
-            "confirmed": False,
-            "confirmation_code": confirmation_code,
-            "created_at": datetime.now(UTC).isoformat(),
-            "updated_at": datetime.now(UTC).isoformat(),
-        }
-    )
-
-    send_email_confirmation_code(email, confirmation_code, email_source)
+    user = {
+        "PK": user_id,
+        "SK": "USER",
+        "email": email,
+        "hashed_password": hashed_password,
+        "confirmed": False,
+        "confirmation_code": confirmation_code,
+        "created_at": datetime.now(UTC).isoformat(),
+        "updated_at": datetime.now(UTC).isoformat(),
+    }
+
+    # One atomic write: the email claim (fails if the email is taken), the
+    # user, and the outbox record the worker sends the email from
+    client = table.meta.client
+    try:
+        client.transact_write_items(
+            TransactItems=[
+                claim_put(table_name, email, user_id),
+                {"Put": {"TableName": table_name, "Item": user}},
+                {
+                    "Put": {
+                        "TableName": table_name,
+                        "Item": outbox_item(email, confirmation_code, email_source),
+                    }
+                },
+            ]
+        )
+    except client.exceptions.TransactionCanceledException as e:
+        if not claim_failed(e):
+            raise
+        logger.error("Email already exists", extra={"email": email})
+        return {
+            "error": "Email already exists",
+        }, 400
 
     return {
         "message": "Check your email for the confirmation code",
@@ -0,0 +1,125 @@
+"""
+Per-route latency metrics for the userservice API.
+
+latency_middleware times each request end to end. Every AWS client from the
+registry is hooked so its calls (DynamoDB.Query, DynamoDB.PutItem,
+SecretsManager.GetSecretValue, SES.SendRawEmail, ...) are timed too, and
+`timed()` covers local work such as password hashing. At the end of the
+request everything is exported with route and cold_start dimensions:
+
+  - PowertoolsExporter (default): Powertools Metrics, flushed as one EMF line
+    per invocation by @metrics.log_metrics on api.main. CloudWatch keeps the
+    values as distributions, so p50/p99 per route come straight from it.
+  - LocalExporter (METRICS_EXPORTER=local, or use_exporter()): keeps records
+    in memory for tests and local load runs.
+"""
+
+import os
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+NAMESPACE = "BaseLayerCapital"
+
+metrics = Metrics(namespace=NAMESPACE, service="userservice")
+
+# Milliseconds per downstream call name for the request in flight
+_timings = defaultdict(float)
+_cold_start = True
+
+
+class PowertoolsExporter:
+    def export(self, route: str, cold_start: bool, total_ms: float, timings: dict):
+        metrics.add_dimension(name="route", value=route)
+        metrics.add_dimension(name="cold_start", value=str(cold_start).lower())
+        metrics.add_metric(
+            name="RouteLatency", unit=MetricUnit.Milliseconds, value=total_ms
+        )
+        for name, ms in timings.items():
+            metrics.add_metric(name=name, unit=MetricUnit.Milliseconds, value=ms)
+
+
+class LocalExporter:
+    def __init__(self):
+        self.records = []
+
+    def export(self, route: str, cold_start: bool, total_ms: float, timings: dict):
+        self.records.append(
+            {
+                "route": route,
+                "cold_start": cold_start,
+                "RouteLatency": total_ms,
+                **timings,
+            }
+        )
+
+    def percentiles(self, route: str, metric: str = "RouteLatency") -> dict:
+        values = sorted(
+            r[metric] for r in self.records if r["route"] == route and metric in r
+        )
+        if not values:
+            return {}
+        if len(values) == 1:
+            return {"count": 1, "p50": values[0], "p99": values[0]}
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        return {"count": len(values), "p50": cuts[49], "p99": cuts[98]}
+
+
+exporter = (
+    LocalExporter()
+    if os.environ.get("METRICS_EXPORTER") == "local"
+    else PowertoolsExporter()
+)
+
+
+def use_exporter(new_exporter):
+    global exporter
+    exporter = new_exporter
+    return new_exporter
+
+
+@contextmanager
+def timed(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[name] += (time.perf_counter() - start) * 1000
+
+
+def _before_call(model, context, **kwargs):
+    context["instrumentation_started"] = time.perf_counter()
+
+
+def _after_call(model, context, **kwargs):
+    started = context.get("instrumentation_started")
+    if started is not None:
+        service = model.service_model.service_id.replace(" ", "")
+        _timings[f"{service}.{model.name}"] += (time.perf_counter() - started) * 1000
+
+
+def instrument_client(client):
+    """
+    Times every API call made through `client`, retries included.
+    """
+    client.meta.events.register("before-call", _before_call)
+    client.meta.events.register("after-call", _after_call)
+    return client
+
+
+def latency_middleware(app, next_middleware):
+    global _cold_start
+
+    _timings.clear()
+    route = f"{app.current_event.http_method} {app.current_event.path}"
+    start = time.perf_counter()
+    try:
+        return next_middleware(app)
+    finally:
+        total_ms = (time.perf_counter() - start) * 1000
+        exporter.export(route, _cold_start, total_ms, dict(_timings))
+        _cold_start = False
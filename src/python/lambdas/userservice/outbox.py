@@ -0,0 +1,104 @@
+"""
+Outbox for confirmation emails.
+
+Signup writes an OUTBOX#<id> item in the same transaction as the user, and
+returns without waiting on SES. The UserService table stream hands new outbox
+items to email_worker.handler, which sends them and deletes what it delivered.
+
+LocalQueue stands in for the stream in tests and local runs.
+"""
+
+import itertools
+import uuid
+from collections import deque
+from datetime import UTC, datetime
+
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import TypeSerializer
+
+OUTBOX_PREFIX = "OUTBOX#"
+OUTBOX_SK = "EMAIL"
+DEFAULT_SOURCE = "noreply@baselayercapital.com"
+
+
+def outbox_item(email: str, code: str, source: str = DEFAULT_SOURCE) -> dict:
+    return {
+        "PK": f"{OUTBOX_PREFIX}{uuid.uuid4()}",
+        "SK": OUTBOX_SK,
+        "kind": "confirmation_code",
+        "email": email,
+        "code": code,
+        "source": source,
+        "created_at": datetime.now(UTC).isoformat(),
+    }
+
+
+class LocalQueue:
+    """
+    In-process stand-in for the table stream: wraps outbox items as stream
+    INSERT records and feeds them to the worker in batches, re-queueing the
+    records it reports in batchItemFailures up to `max_attempts` times.
+    """
+
+    def __init__(self):
+        self._records = deque()
+        self._sequence = itertools.count(1)
+        self._serializer = TypeSerializer()
+
+    def __len__(self):
+        return len(self._records)
+
+    def publish(self, item: dict):
+        image = {k: self._serializer.serialize(v) for k, v in item.items()}
+        self._records.append(
+            {
+                "eventName": "INSERT",
+                "dynamodb": {
+                    "Keys": {"PK": image["PK"], "SK": image["SK"]},
+                    "NewImage": image,
+                    "SequenceNumber": str(next(self._sequence)),
+                },
+            }
+        )
+
+    def load_pending(self, table) -> int:
+        """
+        Queues every outbox item still in `table`; also how stuck items are
+        redriven after the stream has given up on them.
+        """
+        kwargs = {"FilterExpression": Attr("PK").begins_with(OUTBOX_PREFIX)}
+        count = 0
+        while True:
+            response = table.scan(**kwargs)
+            for item in response.get("Items", []):
+                self.publish(item)
+                count += 1
+            if "LastEvaluatedKey" not in response:
+                return count
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def drain(self, handler, batch_size: int = 25, max_attempts: int = 5) -> dict:
+        attempts, delivered, dropped = {}, 0, []
+
+        while self._records:
+            batch = [
+                self._records.popleft()
+                for _ in range(min(batch_size, len(self._records)))
+            ]
+            response = handler({"Records": batch}, None) or {}
+            failed = {
+                f["itemIdentifier"] for f in response.get("batchItemFailures", [])
+            }
+
+            for record in batch:
+                sequence = record["dynamodb"]["SequenceNumber"]
+                if sequence not in failed:
+                    delivered += 1
+                    continue
+                attempts[sequence] = attempts.get(sequence, 0) + 1
+                if attempts[sequence] < max_attempts:
+                    self._records.append(record)
+                else:
+                    dropped.append(record)
+
+        return {"delivered": delivered, "dropped": len(dropped)}
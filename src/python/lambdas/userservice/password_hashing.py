@@ -0,0 +1,163 @@
+"""
+Pluggable password hashers.
+
+Stored hashes carry their algorithm and cost, so a hash made with old
+parameters still verifies after the cost changes and is upgraded on the next
+successful login:
+
+    scrypt$<n>$<r>$<p>$<salt hex>$<hash hex>
+    $argon2id$v=19$m=<KiB>,t=<passes>,p=<lanes>$...   (argon2-cffi format)
+    <sha512 hex>, with the salt in password_salt        (legacy)
+
+PASSWORD_HASHER picks the hasher for new hashes ("scrypt" by default;
+"argon2" needs argon2-cffi in the layer).
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+
+# Never go below this, whatever the latency: a smaller N is too cheap to brute
+# force. Functions that hash passwords should be sized for it instead.
+MIN_SCRYPT_N = 2**14
+
+# scrypt N per Lambda memory size (MB) for ~100 ms per hash, from
+#   python -m benchmarks.bench_password_hashing --target-ms 100
+# Lambda CPU share grows with memory up to a full vCPU at 1769 MB, so the
+# same N costs proportionally more on smaller functions. Below 512 MB the
+# target would need less than MIN_SCRYPT_N, so those sizes get the floor
+# (and take longer than the target).
+SCRYPT_N_BY_MEMORY = {
+    512: MIN_SCRYPT_N,
+    1024: 2**15,
+    1769: 2**16,
+}
+
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 64
+
+
+def lambda_memory_mb() -> int:
+    return int(os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "512"))
+
+
+def scrypt_n_for_memory(memory_mb: int = None) -> int:
+    memory_mb = memory_mb or lambda_memory_mb()
+    sizes = [size for size in SCRYPT_N_BY_MEMORY if size <= memory_mb]
+    return SCRYPT_N_BY_MEMORY[max(sizes)] if sizes else MIN_SCRYPT_N
+
+
+def legacy_sha512(password: str, pepper: str, salt: str) -> str:
+    return hashlib.sha512((password + salt + pepper).encode()).hexdigest()
+
+
+class ScryptHasher:
+    name = "scrypt"
+
+    def __init__(self, n: int = None, r: int = SCRYPT_R, p: int = SCRYPT_P):
+        self.n = n or scrypt_n_for_memory()
+        self.r = r
+        self.p = p
+
+    @staticmethod
+    def _derive(password: str, pepper: str, salt: bytes, n: int, r: int, p: int):
+        return hashlib.scrypt(
+            (password + pepper).encode(),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            # OpenSSL's default 32 MB cap is below 128 * N * r for N >= 2**15
+            maxmem=256 * n * r,
+            dklen=HASH_BYTES,
+        )
+
+    def hash(self, password: str, pepper: str) -> str:
+        salt = secrets.token_bytes(SALT_BYTES)
+        digest = self._derive(password, pepper, salt, self.n, self.r, self.p)
+        return f"scrypt${self.n}${self.r}${self.p}${salt.hex()}${digest.hex()}"
+
+    def verify(self, encoded: str, password: str, pepper: str) -> bool:
+        _, n, r, p, salt, digest = encoded.split("$")
+        derived = self._derive(
+            password, pepper, bytes.fromhex(salt), int(n), int(r), int(p)
+        )
+        return hmac.compare_digest(derived.hex(), digest)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        if not encoded.startswith("scrypt$"):
+            return True
+        _, n, r, p, _, _ = encoded.split("$")
+        return (int(n), int(r), int(p)) != (self.n, self.r, self.p)
+
+
+class Argon2Hasher:
+    name = "argon2"
+
+    def __init__(self, time_cost: int = 2, memory_cost: int = 19456, parallelism=1):
+        from argon2 import PasswordHasher
+
+        self._hasher = PasswordHasher(
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+
+    def hash(self, password: str, pepper: str) -> str:
+        return self._hasher.hash(password + pepper)
+
+    def verify(self, encoded: str, password: str, pepper: str) -> bool:
+        from argon2.exceptions import VerificationError
+
+        try:
+            return self._hasher.verify(encoded, password + pepper)
+        except VerificationError:
+            return False
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return not encoded.startswith("$argon2") or self._hasher.check_needs_rehash(
+            encoded
+        )
+
+
+HASHERS = {"scrypt": ScryptHasher, "argon2": Argon2Hasher}
+
+_hasher = None
+
+
+def get_hasher():
+    """
+    The hasher for new hashes, built once per container.
+    """
+    global _hasher
+
+    if _hasher is None:
+        _hasher = HASHERS[os.environ.get("PASSWORD_HASHER", "scrypt")]()
+    return _hasher
+
+
+def hasher_for(encoded: str):
+    current = get_hasher()
+    if encoded.startswith("scrypt$"):
+        return current if current.name == "scrypt" else ScryptHasher()
+    if encoded.startswith("$argon2"):
+        return current if current.name == "argon2" else Argon2Hasher()
+    return None
+
+
+def verify_password(
+    password: str, pepper: str, encoded: str, salt: str = None
+) -> tuple[bool, bool]:
+    """
+    Returns (matches, needs_rehash). Legacy SHA-512 hashes always need a
+    rehash; others when the algorithm or cost differs from the current one.
+    """
+    hasher = hasher_for(encoded)
+    if hasher is None:
+        legacy = legacy_sha512(password, pepper, salt or "")
+        matches = hmac.compare_digest(legacy, encoded)
+        return matches, True
+
+    matches = hasher.verify(encoded, password, pepper)
+    return matches, get_hasher().needs_rehash(encoded)
@@ -0,0 +1,83 @@
+"""
+Per-container registry of AWS clients, tables and secrets.
+
+Everything is built on first use and then reused by every warm invocation of
+the container. Secrets are re-read after SECRET_TTL_SECONDS so a rotated
+value is picked up without a redeploy. The time spent building each entry is
+kept in `init_timings` for the cold-start report, and every client is hooked
+into the per-request latency metrics.
+"""
+
+import json
+import os
+import time
+
+import boto3
+
+from instrumentation import instrument_client
+
+AWS_REGION = os.environ.get("REGION", os.environ.get("AWS_REGION", "us-east-1"))
+SECRET_TTL_SECONDS = float(os.environ.get("SECRET_TTL_SECONDS", "300"))
+
+_clients = {}
+_tables = {}
+_secrets = {}  # (name, region) -> (expires_at, SecretString)
+
+# "client:ses", "table:dev-UserService", "secret:baselayercapital/PEPPER" -> ms
+init_timings = {}
+
+
+def _timed(name: str, build):
+    start = time.perf_counter()
+    value = build()
+    init_timings[name] = round((time.perf_counter() - start) * 1000, 2)
+    return value
+
+
+def get_client(service: str, region_name: str = AWS_REGION):
+    key = (service, region_name)
+    if key not in _clients:
+        _clients[key] = _timed(
+            f"client:{service}",
+            lambda: instrument_client(boto3.client(service, region_name=region_name)),
+        )
+    return _clients[key]
+
+
+def get_table(table_name: str):
+    if table_name not in _tables:
+        table = _timed(
+            f"table:{table_name}",
+            lambda: boto3.resource("dynamodb", region_name=AWS_REGION).Table(
+                table_name
+            ),
+        )
+        instrument_client(table.meta.client)
+        _tables[table_name] = table
+    return _tables[table_name]
+
+
+def get_secret(secret_name: str, to_dict: bool = False, region_name: str = AWS_REGION):
+    key = (secret_name, region_name)
+    cached = _secrets.get(key)
+
+    if cached is None or cached[0] <= time.monotonic():
+        client = get_client("secretsmanager", region_name)
+        value = _timed(
+            f"secret:{secret_name}",
+            lambda: client.get_secret_value(SecretId=secret_name)["SecretString"],
+        )
+        cached = (time.monotonic() + SECRET_TTL_SECONDS, value)
+        _secrets[key] = cached
+
+    return json.loads(cached[1]) if to_dict else cached[1]
+
+
+def reset():
+    """
+    Drops every cached client, table and secret (tests, local runs).
+    """
+    _clients.clear()
+    _tables.clear()
+    _secrets.clear()
+    init_timings.clear()
@@ -1,43 +1,212 @@
 # import defaultdict
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import boto3
 import os
-from boto3.dynamodb.conditions import Key
+import time
+from boto3.dynamodb.conditions import Attr, Key
 
 ENV_NAME = os.getenv("ENV_NAME", "dev")
 TABLE_NAME = os.getenv("BLC_EVENT_TABLE", f"{ENV_NAME}-BLCEventTable")
 
+# Sort-key split points for parallel mode. A Query can't be segmented like a
+# Scan, so the ticker's SK range is cut into contiguous slices that are queried
+# concurrently: [.., DISTRO#], [DISTRO#, OPTION#], [OPTION#, SUMMARY#], [SUMMARY#, ..]
+SEGMENT_BOUNDARIES = ["DISTRO#", "OPTION#", "SUMMARY#"]
+
+# Query results are shared by every BLCEvents built in this process for the
+# same ticker/prefix/filters until they expire; treat them as read-only
+CACHE_TTL = float(os.getenv("BLC_EVENTS_CACHE_TTL", "60"))
+
+_table = None
+_cache = {}
+
+
+def get_table():
+    global _table
+
+    if _table is None:
+        _table = boto3.resource("dynamodb").Table(TABLE_NAME)
+    return _table
+
+
+def cached(key: tuple, loader) -> list[dict]:
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    items = loader()
+    _cache[key] = (now + CACHE_TTL, items)
+    return items
+
+
+def clear_cache():
+    _cache.clear()
+
 
 class BLCEvents:
-    def __init__(self, ticker: str, sk_prefix: str = None, filters: dict = None):
+    def __init__(
+        self,
+        ticker: str,
+        sk_prefix: str = None,
+        filters: dict = None,
+        attributes: list[str] = None,
+        parallel: bool = False,
+    ):
         self.ticker = ticker.upper()
         self.pk = f"TICKER#{self.ticker}"
         self.sk_prefix = sk_prefix  # e.g. "DISTRO#", "BUY#", etc.
-        self.filters = filters or {}  # optional future flexibility
-        self._raw_items = self.fetch_from_dynamo()
-        self._index_items_by_type()
+        self.filters = filters or {}  # attribute -> value, applied server-side
+        self.attributes = attributes  # optional projection; PK/SK always included
+        self.parallel = parallel
 
-    def fetch_from_dynamo(self) -> list[dict]:
-        table = boto3.resource("dynamodb").Table(TABLE_NAME)
+        # Nothing is fetched until first use
+        self._raw_items = None
+        self._by_type = None
+        self._type_items = {}  # event type -> items sorted by SK
+        self._type_keys = {}  # event type -> SK suffixes (dates), for bisect
+
+    def _cache_key(self, sk_prefix: str) -> tuple:
+        return (
+            self.pk,
+            sk_prefix,
+            tuple(sorted(self.filters.items())),
+            tuple(self.attributes or ()),
+        )
+
+    @property
+    def items(self) -> list[dict]:
+        if self._raw_items is None:
+            self._raw_items = cached(
+                self._cache_key(self.sk_prefix), self.fetch_from_dynamo
+            )
+        return self._raw_items
+
+    @property
+    def by_type(self) -> dict:
+        if self._by_type is None:
+            self._index_items_by_type()
+        return self._by_type
 
+    def _query_kwargs(self) -> dict:
+        """
+        Pushes `filters` down as a FilterExpression and `attributes` as a
+        ProjectionExpression, so DynamoDB only returns what's needed.
+        """
+        kwargs = {"TableName": TABLE_NAME}
+
+        if self.filters:
+            conditions = [Attr(key).eq(value) for key, value in self.filters.items()]
+            expr = conditions[0]
+            for condition in conditions[1:]:
+                expr &= condition
+            kwargs["FilterExpression"] = expr
+
+        if self.attributes:
+            names = list(dict.fromkeys(["PK", "SK", *self.attributes]))
+            kwargs["ProjectionExpression"] = ", ".join(
+                f"#p{i}" for i in range(len(names))
+            )
+            kwargs["ExpressionAttributeNames"] = {
+                f"#p{i}": name for i, name in enumerate(names)
+            }
+
+        return kwargs
+
+    def _key_conditions(self) -> list:
         key_expr = Key("PK").eq(self.pk)
         if self.sk_prefix:
-            key_expr &= Key("SK").begins_with(self.sk_prefix)
+            return [key_expr & Key("SK").begins_with(self.sk_prefix)]
+        if not self.parallel:
+            return [key_expr]
+
+        bounds = SEGMENT_BOUNDARIES
+        return [
+            key_expr & Key("SK").lt(bounds[0]),
+            *(
+                key_expr & Key("SK").between(lo, hi)
+                for lo, hi in zip(bounds, bounds[1:])
+            ),
+            key_expr & Key("SK").gte(bounds[-1]),
+        ]
+
+    def iter_items(self, key_expr=None):
+        """
+        Yields every matching item, following LastEvaluatedKey so partitions
+        over 1 MB aren't truncated.
+        """
+        # The resource's client: thread-safe, and still takes Key/Attr
+        # conditions and returns plain Python values
+        client = get_table().meta.client
+        kwargs = self._query_kwargs()
+        kwargs["KeyConditionExpression"] = key_expr or self._key_conditions()[0]
+
+        while True:
+            response = client.query(**kwargs)
+            yield from response.get("Items", [])
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
-        response = table.query(KeyConditionExpression=key_expr)
-        items = response.get("Items", [])
+    def fetch_from_dynamo(self) -> list[dict]:
+        conditions = self._key_conditions()
+        if len(conditions) == 1:
+            return list(self.iter_items(conditions[0]))
 
-        # Optional: Apply Python-side filters
-        for key, value in self.filters.items():
-            items = [item for item in items if item.get(key) == value]
+        with ThreadPoolExecutor(max_workers=len(conditions)) as pool:
+            segments = pool.map(lambda c: list(self.iter_items(c)), conditions)
 
-        return items
+        # `between` is inclusive, so an SK equal to a boundary can appear twice
+        items = {}
+        for segment in segments:
+            for item in segment:
+                items[item["SK"]] = item
+        return list(items.values())
 
     def _index_items_by_type(self):
-        self.by_type = defaultdict(list)
-        for item in self._raw_items:
+        self._by_type = defaultdict(list)
+        for item in self.items:
             prefix = item["SK"].split("#")[0]
-            self.by_type[prefix].append(item)
+            self._by_type[prefix].append(item)
+
+    def get_all_by_type(self, event_type: str) -> list[dict]:
+        """
+        Items of one type (e.g. "DISTRO") sorted by SK. Unless everything is
+        already loaded, this runs a begins_with("DISTRO#") query for just that
+        type instead of pulling the whole ticker.
+        """
+        if event_type not in self._type_items:
+            if self._raw_items is not None or self.sk_prefix:
+                items = self.by_type.get(event_type, [])
+            else:
+                prefix = f"{event_type}#"
+                key_expr = Key("PK").eq(self.pk) & Key("SK").begins_with(prefix)
+                items = cached(
+                    self._cache_key(prefix), lambda: list(self.iter_items(key_expr))
+                )
+
+            items = sorted(items, key=lambda item: item["SK"])
+            self._type_items[event_type] = items
+            self._type_keys[event_type] = [
+                item["SK"].partition("#")[2] for item in items
+            ]
+
+        return self._type_items[event_type]
+
+    def get_range(self, event_type: str, start: str = None, end: str = None):
+        """
+        Items of `event_type` whose SK date falls in [start, end] (inclusive,
+        "YYYY-MM-DD"), found by bisecting the sorted per-type index.
+        """
+        items = self.get_all_by_type(event_type)
+        keys = self._type_keys[event_type]
+
+        lo = bisect_left(keys, start) if start else 0
+        # "\uffff" sorts after any suffix, e.g. "2025-07-09#2" for end "2025-07-09"
+        hi = bisect_right(keys, end + "\uffff") if end else len(keys)
+        return items[lo:hi]
 
     # def get_distributions(self):
     #     return self.by_type.get("DISTRO", [])
@@ -50,6 +219,3 @@ class BLCEvents:
 
     # def get_summary(self):
     #     return [item for item in self._raw_items if item["SK"].startswith("SUMMARY#")]
-
-    # def get_all_by_type(self, event_type: str):
-    #     return self.by_type.get(event_type, [])
@@ -0,0 +1,14 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lambda modules import their siblings as top-level modules, as in the bundle
+sys.path[:0] = [
+    ROOT,
+    os.path.join(ROOT, "src", "python"),
+    os.path.join(ROOT, "src", "python", "lambdas", "ingest_lambda"),
+]
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("ENV_NAME", "dev")
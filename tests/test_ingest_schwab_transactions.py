@@ -0,0 +1,49 @@
+import json
+import uuid
+
+import pytest
+
+import ingest_schwab_transactions as ingest
+from benchmarks.local_dynamo import moto_table
+
+FILL = {
+    "Date": "07/09/2025",
+    "Action": "Buy",
+    "Symbol": "MSTY",
+    "Description": "YIELDMAX MSTR OPTION INCOME",
+    "Quantity": "10",
+    "Price": "$20.00",
+    "Fees & Comm": "",
+    "Amount": "-$200.00",
+}
+
+
+@pytest.fixture
+def table():
+    with moto_table(ingest.TransactionsTableName) as table:
+        ingest.init_env()
+        yield table
+
+
+def test_repeat_fills_are_kept_and_reimport_is_idempotent(table):
+    export = [FILL, dict(FILL), {**FILL, "Date": "07/10/2025"}]
+
+    assert ingest.write_transactions_to_dynamo(export)["written"] == 3
+    assert ingest.write_transactions_to_dynamo(export) == {"written": 0, "skipped": 3}
+
+
+def test_fingerprint_ignores_key_order_and_whitespace():
+    reordered = dict(reversed(list(FILL.items())))
+    spaced = {**FILL, "Description": "  YIELDMAX  MSTR OPTION INCOME "}
+
+    assert ingest.fingerprint(reordered) == ingest.fingerprint(FILL)
+    assert ingest.fingerprint(spaced) == ingest.fingerprint(FILL)
+    assert ingest.fingerprint(FILL, 1) != ingest.fingerprint(FILL)
+
+
+def test_rows_under_legacy_keys_are_not_written_again(table):
+    item = ingest.build_item(FILL)
+    item["PK"] = uuid.uuid3(uuid.NAMESPACE_DNS, json.dumps(FILL)).hex
+    table.put_item(Item=item)
+
+    assert ingest.write_transactions_to_dynamo([FILL]) == {"written": 0, "skipped": 1}
@@ -0,0 +1,172 @@
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Key
+
+import ingest_schwab_transactions as ingest
+import ledger
+from benchmarks.local_dynamo import moto_table
+
+
+@pytest.fixture
+def table():
+    with moto_table(
+        ingest.TransactionsTableName,
+        indexes={ledger.INGESTED_INDEX: ("Source", "IngestedAt")},
+    ) as table:
+        ingest.init_env()
+        yield table
+
+
+def txn(date, action, symbol, quantity="", amount="", price=""):
+    return {
+        "Date": date,
+        "Action": action,
+        "Symbol": symbol,
+        "Description": "",
+        "Quantity": quantity,
+        "Price": price,
+        "Fees & Comm": "",
+        "Amount": amount,
+    }
+
+
+def position(symbol):
+    return ledger.get_portfolio(ingest.TransactionsTable)["positions"][symbol]
+
+
+def put_legacy(table, row):
+    """
+    A row as the ingest wrote it before fingerprints and IngestedAt.
+    """
+    item = ingest.build_item(row)
+    item.pop("IngestedAt", None)
+    item["PK"] = uuid.uuid3(uuid.NAMESPACE_DNS, json.dumps(row)).hex
+    table.put_item(Item=item)
+
+
+def test_ingest_applies_its_own_rows(table):
+    ingest.handler(
+        {"transactions": [txn("07/01/2025", "Buy", "MSTY", "10", "-$200.00")]}, None
+    )
+
+    portfolio = ledger.get_portfolio(table)
+    assert portfolio["positions"]["MSTY"]["quantity"] == 10
+    assert portfolio["cash"] == Decimal("-200.00")
+    assert ledger.get_portfolio(table, "2025-07-01")["rows"] == 1
+
+
+def test_first_update_counts_legacy_rows(table):
+    put_legacy(table, txn("06/02/2025", "Buy", "MSTY", "10", "-$200.00"))
+
+    ingest.handler(
+        {"transactions": [txn("07/01/2025", "Sell", "MSTY", "5", "$120.00")]}, None
+    )
+
+    msty = position("MSTY")
+    assert msty["quantity"] == 5
+    assert msty["cost_basis"] == Decimal("100")
+    assert msty["realized_pnl"] == Decimal("20")
+
+
+def test_incremental_update_reads_only_new_rows(table):
+    ingest.handler(
+        {"transactions": [txn("07/01/2025", "Buy", "MSTY", "10", "-$200.00")]}, None
+    )
+    ingest.handler(
+        {
+            "transactions": [
+                txn("07/01/2025", "Buy", "MSTY", "10", "-$200.00"),
+                txn("07/08/2025", "Qualified Dividend", "MSTY", amount="$15.00"),
+            ]
+        },
+        None,
+    )
+
+    state = ledger.get_portfolio(table)
+    assert state["rows"] == 2
+    assert state["version"] == 2
+    assert position("MSTY")["distributions"] == Decimal("15.00")
+
+
+def test_backdated_row_rebuilds(table):
+    ingest.handler(
+        {
+            "transactions": [
+                txn("07/10/2025", "Sell", "MSTY", "10", "$300.00"),
+                txn("07/01/2025", "Buy", "MSTY", "20", "-$400.00"),
+            ]
+        },
+        None,
+    )
+    # Posted later, effective before the ledger's as_of
+    ingest.handler(
+        {
+            "transactions": [
+                txn("07/11/2025 as of 07/05/2025", "Buy", "MSTY", "20", "-$600.00")
+            ]
+        },
+        None,
+    )
+
+    msty = position("MSTY")
+    assert msty["quantity"] == 30
+    # Sold 10 at an average cost of 25 after the backdated buy, not 20
+    assert msty["realized_pnl"] == Decimal("50")
+    assert ledger.get_portfolio(table)["rows"] == 3
+    assert ledger.get_portfolio(table, "2025-07-05")["positions"]["MSTY"][
+        "quantity"
+    ] == Decimal("40")
+
+
+def test_running_ingest_holds_back_later_rows(table):
+    with ledger.ingest_run(table) as running:
+        table.put_item(
+            Item=ingest.build_item(
+                txn("07/01/2025", "Buy", "AAA", "10", "-$100.00"), ingested_at=running
+            )
+        )
+        ingest.handler(
+            {"transactions": [txn("07/02/2025", "Buy", "BBB", "5", "-$50.00")]}, None
+        )
+        assert ledger.get_portfolio(table) is None
+
+    ledger.update_ledger(table)
+    state = ledger.get_portfolio(table)
+    assert sorted(state["positions"]) == ["AAA", "BBB"]
+    runs = table.query(
+        KeyConditionExpression=Key("PK").eq(ledger.LEDGER_PK)
+        & Key("SK").begins_with(ledger.RUN_PREFIX)
+    )
+    assert runs["Count"] == 0
+
+
+def test_closed_positions_are_folded(table):
+    ingest.handler(
+        {
+            "transactions": [
+                txn("07/01/2025", "Buy", "AAA", "10", "-$100.00"),
+                txn("07/02/2025", "Buy", "BBB", "5", "-$50.00"),
+                txn("07/03/2025", "Sell", "BBB", "5", "$70.00"),
+            ]
+        },
+        None,
+    )
+
+    state = ledger.get_portfolio(table)
+    assert sorted(state["positions"]) == ["AAA"]
+    assert state["closed"]["realized_pnl"] == Decimal("20")
+    assert "BBB" not in ledger.get_portfolio(table, "2025-07-03")["positions"]
+
+
+def test_stale_save_is_rejected(table):
+    ingest.handler(
+        {"transactions": [txn("07/01/2025", "Buy", "MSTY", "10", "-$200.00")]}, None
+    )
+    stale = ledger.load_ledger(table)
+    stale.version -= 1
+
+    with pytest.raises(table.meta.client.exceptions.ConditionalCheckFailedException):
+        stale.save(table, [])
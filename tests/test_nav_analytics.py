@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.local_dynamo import moto_table
+from ingestion import dynamo, nav_analytics
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PRICE_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def seed(table, ticker, dates):
+    price = 20.0
+    with table.batch_writer() as batch:
+        for i, day in enumerate(dates):
+            if i and i % 21 == 0:
+                batch.put_item(
+                    Item={
+                        "PK": ticker,
+                        "SK": f"DIST#{day:%Y-%m-%d}",
+                        "ex_date": f"{day:%Y-%m-%d}",
+                        "amount": Decimal("1"),
+                    }
+                )
+            price *= 1.001
+            batch.put_item(
+                Item={
+                    "PK": ticker,
+                    "SK": f"PRICE#{day:%Y-%m-%d}",
+                    "close": Decimal(str(round(price, 4))),
+                }
+            )
+
+
+def test_rolling_regression_matches_polyfit():
+    y = np.cumsum(np.random.default_rng(0).normal(0, 0.02, 300))
+    fit = nav_analytics.rolling_regression(y, 63)
+
+    for end in (62, 150, 299):
+        window = y[end - 62 : end + 1]
+        slope, intercept = np.polyfit(np.arange(63), window, 1)
+        assert fit["slope"][end] == pytest.approx(slope)
+        assert fit["intercept"][end] == pytest.approx(intercept + slope * 62)
+
+
+def test_weekend_ex_date_maps_to_next_trading_day():
+    prices = pd.DataFrame(
+        {"date": pd.to_datetime(["2025-06-06", "2025-06-09"]), "close": [10.0, 9.0]}
+    )
+    dists = pd.DataFrame({"ex_date": pd.to_datetime(["2025-06-07"]), "amount": [1.0]})
+
+    assert nav_analytics.join_distributions(prices, dists)["dist"].tolist() == [0, 1]
+
+
+def test_offline_uses_cached_distributions(cache_dir, monkeypatch):
+    dates = pd.bdate_range("2025-01-01", "2025-06-30")
+    with moto_table("dev-HistoricalData") as table:
+        monkeypatch.setattr(dynamo, "HistoricalDataTable", table)
+        seed(table, "MSTY", dates)
+        online, _ = nav_analytics.analyze_all(["MSTY"])
+
+    def unreachable():
+        raise AssertionError("offline analysis touched DynamoDB")
+
+    monkeypatch.setattr(dynamo, "HistoricalDataTable", None)
+    monkeypatch.setattr(dynamo, "init_env", unreachable)
+    offline, _ = nav_analytics.analyze_all(["MSTY"], offline=True)
+
+    assert offline["ticker"].tolist() == ["MSTY"]
+    assert offline["distributions"].iloc[0] == online["distributions"].iloc[0] > 0
+    assert offline["total_return"].iloc[0] == online["total_return"].iloc[0]
@@ -0,0 +1,120 @@
+# covered_call.py
+"""
+Pricing-driven MSTY distributions.
+
+MSTY holds MSTR exposure and sells a call against it each month; the premium
+is what it distributes. Instead of drawing the yield from a Gaussian, this
+simulates MSTR monthly for every epoch at once, prices the call it would
+sell with Black-Scholes, and settles it at month end:
+
+    premium yield  = call(S, K = S * (1 + otm), 1 month, iv) / S
+    distribution   = capture * premium yield
+    NAV change     = min(MSTR return, otm) + (1 - capture) * premium yield
+                     - expense ratio / 12
+    decay          = -NAV change            (the simulators' sign convention)
+
+Implied vol comes from a VolSurface's monthly forward vols (or a flat `iv`),
+scaled by a bull/bear regime multiplier; the regimes switch after
+exponential durations like the simulators' MSTY regimes. Realized vol is
+implied vol times `realized_to_implied`.
+"""
+
+import math
+
+import numpy as np
+
+from options_pricing import RISK_FREE_RATE, bs_price
+
+MONTH = 1 / 12
+
+DEFAULT_IV = 0.75  # MSTR 30-day IV, roughly, when no surface is given
+DEFAULT_OTM = 0.05  # strike 5% above spot
+EXPENSE_RATIO = 0.0099
+
+# regime -> (annual MSTR drift, IV multiplier, average duration in months)
+DEFAULT_REGIMES = {
+    "bull": (0.40, 1.25, 3),
+    "bear": (-0.20, 0.85, 5),
+}
+
+
+def simulate_regimes(epochs, months, regimes, p_bull=0.7, rng=None):
+    """
+    Boolean (epochs, months) array, True while in the bull regime. Durations
+    are max(2, ceil(exponential(avg duration))), drawn per epoch.
+    """
+    rng = rng or np.random.default_rng()
+    bull_avg, bear_avg = regimes["bull"][2], regimes["bear"][2]
+
+    def durations(is_bull):
+        avg = np.where(is_bull, bull_avg, bear_avg)
+        return np.maximum(2, np.ceil(rng.exponential(avg)))
+
+    bull = np.empty((epochs, months), dtype=bool)
+    current = rng.random(epochs) < p_bull
+    remaining = durations(current)
+    for month in range(months):
+        remaining -= 1
+        flip = remaining <= 0
+        current = np.where(flip, ~current, current)
+        remaining = np.where(flip, durations(current), remaining)
+        bull[:, month] = current
+    return bull
+
+
+def simulate_covered_calls(
+    epochs: int,
+    months: int,
+    surface=None,
+    iv: float = DEFAULT_IV,
+    otm: float = DEFAULT_OTM,
+    capture: float = 1.0,
+    realized_to_implied: float = 1.0,
+    expense_ratio: float = EXPENSE_RATIO,
+    rate: float = RISK_FREE_RATE,
+    regimes: dict | None = None,
+    seed: int | None = None,
+) -> dict:
+    """
+    (epochs, months) float arrays: mstr_return, iv, premium_yield, dist_yield,
+    nav_return and decay, plus the boolean bull regime array. Every epoch and
+    month is priced in a single vectorized Black-Scholes call.
+    """
+    regimes = regimes or DEFAULT_REGIMES
+    rng = np.random.default_rng(seed)
+
+    if surface is not None:
+        base_iv = np.asarray(
+            surface.monthly_forward_vols(months, 1.0 + otm), dtype="float64"
+        )
+    else:
+        base_iv = np.full(months, iv)
+
+    bull = simulate_regimes(epochs, months, regimes, rng=rng)
+    drift = np.where(bull, regimes["bull"][0], regimes["bear"][0])
+    implied = base_iv * np.where(bull, regimes["bull"][1], regimes["bear"][1])
+
+    realized = implied * realized_to_implied
+    z = rng.standard_normal((epochs, months))
+    mstr_return = np.expm1(
+        (drift - 0.5 * realized**2) * MONTH + realized * math.sqrt(MONTH) * z
+    )
+
+    # Per unit of spot: the call is struck at 1 + otm, one month out
+    premium_yield = bs_price(1.0, 1.0 + otm, MONTH, implied, True, rate)
+    dist_yield = capture * premium_yield
+    nav_return = (
+        np.minimum(mstr_return, otm)
+        + (1.0 - capture) * premium_yield
+        - expense_ratio / 12
+    )
+
+    return {
+        "bull": bull,
+        "mstr_return": mstr_return,
+        "iv": implied,
+        "premium_yield": premium_yield,
+        "dist_yield": dist_yield,
+        "nav_return": nav_return,
+        "decay": -nav_return,
+    }
@@ -1,7 +1,40 @@
 # simulations.py
 import random
 
+from utils.covered_call import simulate_covered_calls
 from utils.taxes import STATE, monthly_federal_tax
+from utils.vol_surface import load_surface
+
+
+def vol_surface(cfg):
+    chain = getattr(cfg, "vol_surface_chain", None)
+    return load_surface(chain, cfg.vol_surface_spot) if chain else None
+
+
+def decay_vol_scale(cfg, month):
+    surface = vol_surface(cfg)
+    if surface is None:
+        return 1.0
+    scale = surface.decay_vol_scale(cfg.months)
+    return scale[min(month, len(scale)) - 1]
+
+
+def covered_call_month(state):
+    """
+    (decay, dist yield, bull) for state.month from the game's simulated MSTR
+    covered-call path, drawn cfg.months at a time as the game goes on.
+    """
+    cfg = state.cfg
+    while len(state.covered_call_path) < state.month:
+        path = simulate_covered_calls(1, cfg.months, surface=vol_surface(cfg))
+        state.covered_call_path.extend(
+            zip(
+                path["decay"][0].tolist(),
+                path["dist_yield"][0].tolist(),
+                path["bull"][0].tolist(),
+            )
+        )
+    return state.covered_call_path[state.month - 1]
 
 
 def simulate_month(state):
@@ -20,26 +53,31 @@ def simulate_month(state):
         state.regime = "bull"
 
     # === NAV Decay + Yield ===
-    if state.regime == "bull":
-        mean_decay = cfg.bull_mean_decay
-        std_dev_decay = cfg.bull_std_dev_decay
+    if getattr(cfg, "distribution_model", "gaussian") == "covered_call":
+        decay, dy, bull = covered_call_month(state)
+        state.regime = "bull" if bull else "bear"
     else:
-        mean_decay = cfg.bear_mean_decay
-        std_dev_decay = cfg.bear_std_dev_decay
-
-    decay = random.gauss(mean_decay, std_dev_decay)
-    decay = max(cfg.decay_low, min(decay, cfg.decay_high))
-    # dy = random.gauss(cfg.mean_yield, cfg.std_dev_yield)
-
-    # Steep nonlinear scale + noise
-    nav_up = max(0, -decay)
-
-    # Logistic-style curve or steep polynomial
-    base_dy = 0.08 + 0.60 * nav_up**1.5  # rapid rise for big gains
-    dy = random.gauss(base_dy, 0.01)
-    dy = max(cfg.dist_yield_low, min(dy, cfg.dist_yield_high))
-
-    # dy = max(cfg.dist_yield_low, min(dy, cfg.dist_yield_high))
+        if state.regime == "bull":
+            mean_decay = cfg.bull_mean_decay
+            std_dev_decay = cfg.bull_std_dev_decay
+        else:
+            mean_decay = cfg.bear_mean_decay
+            std_dev_decay = cfg.bear_std_dev_decay
+        std_dev_decay *= decay_vol_scale(cfg, month)
+
+        decay = random.gauss(mean_decay, std_dev_decay)
+        decay = max(cfg.decay_low, min(decay, cfg.decay_high))
+        # dy = random.gauss(cfg.mean_yield, cfg.std_dev_yield)
+
+        # Steep nonlinear scale + noise
+        nav_up = max(0, -decay)
+
+        # Logistic-style curve or steep polynomial
+        base_dy = 0.08 + 0.60 * nav_up**1.5  # rapid rise for big gains
+        dy = random.gauss(base_dy, 0.01)
+        dy = max(cfg.dist_yield_low, min(dy, cfg.dist_yield_high))
+
+        # dy = max(cfg.dist_yield_low, min(dy, cfg.dist_yield_high))
 
     state.msty_price *= 1 - decay
     distribution_amount = state.msty_price * dy
@@ -0,0 +1,186 @@
+# vol_surface.py
+"""
+Implied-volatility surface for the simulators.
+
+A surface is fitted once from a priced chain (options_pricing.price_chain) or
+from an ATM term structure (the implied_vol KPI) onto a regular grid of total
+variance w = iv^2 * t over log-moneyness x = ln(K / S) and years to expiry t:
+
+  - across strikes each expiry is interpolated linearly in x, flat outside
+    the quoted strikes (out-of-the-money side only; ITM quotes carry little
+    vol information);
+  - across expiries w is linear in t (zero at t = 0), kept non-decreasing so
+    forward variances are never negative, and extended at the last expiry's
+    vol.
+
+Lookups are then bilinear on the grid: `iv()` for one point in plain Python
+(cheap enough per month per epoch) and `iv_grid()` for arrays.
+load_surface() caches fitted surfaces per chain file.
+"""
+
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+
+X_MIN, X_MAX, X_STEPS = -1.5, 1.5, 301
+T_STEP = 7 / 365  # weekly rows
+MONTH = 1 / 12
+
+
+class VolSurface:
+    def __init__(self, x_grid: np.ndarray, t_grid: np.ndarray, w_grid: np.ndarray):
+        self.x_grid = x_grid
+        self.t_grid = t_grid
+        self.w_grid = w_grid
+        self._x0, self._dx = float(x_grid[0]), float(x_grid[1] - x_grid[0])
+        self._dt = float(t_grid[1] - t_grid[0])
+        self._t_max = float(t_grid[-1])
+        # Nested lists index faster than ndarrays from scalar Python code
+        self._rows = w_grid.tolist()
+        self._forward_vols = {}
+
+    @classmethod
+    def from_points(cls, moneyness, t, iv) -> "VolSurface":
+        """
+        Fits scattered (strike / spot, years, iv) quotes; NaNs are ignored.
+        """
+        x = np.log(np.asarray(moneyness, dtype="float64"))
+        t = np.asarray(t, dtype="float64")
+        iv = np.asarray(iv, dtype="float64")
+        keep = np.isfinite(x) & np.isfinite(iv) & (iv > 0) & (t > 0)
+        x, t, iv = x[keep], t[keep], iv[keep]
+        if not len(iv):
+            raise ValueError("no usable implied vol quotes")
+
+        x_grid = np.linspace(X_MIN, X_MAX, X_STEPS)
+        expiries = np.unique(t)
+        slices = np.empty((len(expiries) + 1, X_STEPS))
+        slices[0] = 0.0
+        for i, expiry in enumerate(expiries, start=1):
+            at = t == expiry
+            order = np.argsort(x[at])
+            vol = np.interp(x_grid, x[at][order], iv[at][order])
+            slices[i] = vol * vol * expiry
+        # No calendar arbitrage: total variance never falls with maturity
+        slices = np.maximum.accumulate(slices, axis=0)
+
+        slice_t = np.concatenate([[0.0], expiries])
+        n_t = max(2, math.ceil(expiries[-1] / T_STEP) + 1)
+        t_grid = np.linspace(0.0, expiries[-1], n_t)
+        w_grid = np.empty((n_t, X_STEPS))
+        for j in range(X_STEPS):
+            w_grid[:, j] = np.interp(t_grid, slice_t, slices[:, j])
+        return cls(x_grid, t_grid, w_grid)
+
+    @classmethod
+    def from_chain(cls, priced, spot: float) -> "VolSurface":
+        """
+        From options_pricing.price_chain output: puts below spot, calls at or
+        above it.
+        """
+        otm_put = priced["Strike"] < spot
+        iv = np.where(otm_put, priced["Put_IV"], priced["Call_IV"])
+        return cls.from_points(priced["Strike"] / spot, priced["DTE"] / 365, iv)
+
+    @classmethod
+    def from_term_structure(cls, t, iv) -> "VolSurface":
+        """
+        Flat in strike, e.g. from the implied_vol KPI (percent values should be
+        divided by 100 first). A single point gives a flat surface.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype="float64"))
+        iv = np.atleast_1d(np.asarray(iv, dtype="float64"))
+        moneyness = np.ones(len(t))
+        return cls.from_points(moneyness, t, iv)
+
+    def _w(self, x: float, t: float) -> float:
+        fx = min(max((x - self._x0) / self._dx, 0.0), X_STEPS - 1.0)
+        i = min(int(fx), X_STEPS - 2)
+        ax = fx - i
+        ft = t / self._dt
+        k = min(int(ft), len(self._rows) - 2)
+        at = ft - k
+        low, high = self._rows[k], self._rows[k + 1]
+        w_low = low[i] + (low[i + 1] - low[i]) * ax
+        w_high = high[i] + (high[i + 1] - high[i]) * ax
+        return w_low + (w_high - w_low) * at
+
+    def iv(self, moneyness: float = 1.0, t: float = MONTH) -> float:
+        """
+        Implied vol at strike / spot = `moneyness`, `t` years out.
+        """
+        x = math.log(moneyness)
+        if t > self._t_max:
+            return math.sqrt(self._w(x, self._t_max) / self._t_max)
+        t = max(t, 1e-6)
+        return math.sqrt(max(self._w(x, t), 0.0) / t)
+
+    def iv_grid(self, moneyness, t) -> np.ndarray:
+        """
+        Vectorized iv() over broadcastable arrays.
+        """
+        x, t = np.broadcast_arrays(
+            np.log(np.asarray(moneyness, dtype="float64")),
+            np.asarray(t, dtype="float64"),
+        )
+        t_in = np.clip(t, 1e-6, self._t_max)
+
+        fx = np.clip((x - self._x0) / self._dx, 0.0, X_STEPS - 1.0)
+        i = np.minimum(fx.astype(int), X_STEPS - 2)
+        ax = fx - i
+        ft = t_in / self._dt
+        k = np.minimum(ft.astype(int), len(self.t_grid) - 2)
+        at = ft - k
+
+        w = self.w_grid
+        w_low = w[k, i] + (w[k, i + 1] - w[k, i]) * ax
+        w_high = w[k + 1, i] + (w[k + 1, i + 1] - w[k + 1, i]) * ax
+        total = np.maximum(w_low + (w_high - w_low) * at, 0.0)
+        # Past the last row t_in is t_max, i.e. the last expiry's vol
+        return np.sqrt(total / t_in)
+
+    def forward_vol(self, t1: float, t2: float, moneyness: float = 1.0) -> float:
+        """
+        Vol implied for the period between t1 and t2 years out.
+        """
+        w1 = self.iv(moneyness, t1) ** 2 * t1 if t1 > 0 else 0.0
+        w2 = self.iv(moneyness, t2) ** 2 * t2
+        return math.sqrt(max(w2 - w1, 0.0) / (t2 - t1))
+
+    def monthly_forward_vols(self, months: int, moneyness: float = 1.0) -> tuple:
+        """
+        Forward vol for each simulated month 1..months, computed once.
+        """
+        key = (months, moneyness)
+        if key not in self._forward_vols:
+            self._forward_vols[key] = tuple(
+                self.forward_vol((m - 1) * MONTH, m * MONTH, moneyness)
+                for m in range(1, months + 1)
+            )
+        return self._forward_vols[key]
+
+    def decay_vol_scale(self, months: int) -> tuple:
+        """
+        Each month's forward vol relative to the first month's, for scaling
+        NAV decay dispersion calibrated to today's vol.
+        """
+        vols = self.monthly_forward_vols(months)
+        return tuple(v / vols[0] for v in vols)
+
+
+@lru_cache(maxsize=16)
+def _load_chain_surface(path: str, mtime: float, spot: float) -> VolSurface:
+    from options_pricing import load_chain, price_chain
+
+    with open(path, "r") as f:
+        priced = price_chain(load_chain(f), spot)
+    return VolSurface.from_chain(priced, spot)
+
+
+def load_surface(path: str, spot: float) -> VolSurface:
+    """
+    Surface from a pasted chain file, fitted once per (file version, spot).
+    """
+    return _load_chain_surface(path, os.path.getmtime(path), spot)